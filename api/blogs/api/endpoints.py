@@ -1,96 +1,103 @@
+from asgiref.sync import sync_to_async
 from ninja import File, Form, Query
 from ninja.files import UploadedFile
-from django.shortcuts import get_object_or_404
-from django.db.models import Q
-from django.core.paginator import Paginator
-from blogs.models import Blog, Comment, Category
+from django.http import Http404
+from django.shortcuts import aget_object_or_404, get_object_or_404
+from blogs.categories import get_category_tree
+from blogs.models import Blog, Comment, CommentReaction
+from blogs.reactions import merge_pending_reactions, toggle_reaction, with_pending_reactions
+from blogs.search import search_blogs
+from config.cache import cached_response, conditional_response
+from images.api.schemas import UploadConfirmSchema
+from images.uploads import UploadError, confirm_upload
 from .schemas import (
     BlogCreateSchema,
     BlogFilterSchema,
     CommentCreateSchema,
+    CommentFilterSchema,
     CommentUpdateSchema,
 )
-from datetime import datetime, timedelta
+from .filters import filter_blogs
+from .pagination import (
+    BLOG_ORDERING,
+    InvalidCursor,
+    decode_int_cursor,
+    encode_key,
+    paginate_by_cursor,
+    paginate_by_page,
+)
+from .serializers import (
+    BLOG_LIST_FIELDS,
+    BLOG_DETAIL_FIELDS,
+    BLOG_SEARCH_FIELDS,
+    build_comment_threads,
+    get_blog_detail,
+    get_comment_detail,
+    parse_fields,
+    plan_blogs,
+    plan_comments,
+    serialize_blog,
+    serialize_blogs,
+    serialize_comment,
+)
 from typing import Optional
-from django.utils import timezone
 
 import json
 
 
-def list_blogs(request, filters: BlogFilterSchema = Query(...)):
-    queryset = Blog.objects.filter(is_active=True).order_by('-created_at')
+@cached_response('blogs')
+async def list_blogs(request, filters: BlogFilterSchema = Query(...)):
+    queryset = Blog.objects.filter(is_active=True).order_by(*BLOG_ORDERING)
 
-    if filters.date_from or filters.date_to:
-        try:
-            if filters.date_from:
-                from_date = datetime.strptime(filters.date_from, '%Y-%m-%d')
-                from_date = timezone.make_aware(
-                    datetime.combine(from_date.date(), datetime.min.time())
-                )
-                queryset = queryset.filter(created_at__gte=from_date)
+    queryset = await sync_to_async(filter_blogs)(queryset, filters)
 
-            if filters.date_to:
-                to_date = datetime.strptime(filters.date_to, '%Y-%m-%d')
-                to_date = timezone.make_aware(
-                    datetime.combine(to_date.date(), datetime.max.time())
-                )
-                queryset = queryset.filter(created_at__lte=to_date)
-
-        except ValueError:
-            pass
+    fields = BLOG_LIST_FIELDS
+    if filters.fields:
+        try:
+            fields = parse_fields(filters.fields)
+        except ValueError as e:
+            return 400, {"message": str(e)}
 
-    if filters.author_id:
-        queryset = queryset.filter(author_id=filters.author_id)
+    use_cursor = filters.pagination == 'cursor' or filters.cursor
+    if filters.search:
+        # Cursors seek on (created_at, id) and would drop relevance order.
+        if use_cursor:
+            return 400, {"message": "Search results only support page pagination"}
+        queryset = search_blogs(queryset, filters.search)
+        fields = fields + BLOG_SEARCH_FIELDS
 
-    if filters.category_id:
-        queryset = queryset.filter(category_id=filters.category_id)
+    queryset = plan_blogs(queryset, fields + ('created_at',))
 
-    if filters.tags:
-        queryset = queryset.filter(tags__name__in=filters.tags).distinct()
+    if use_cursor:
+        try:
+            page = await paginate_by_cursor(queryset, filters.cursor, filters.page_size)
+        except InvalidCursor as e:
+            return 400, {"message": str(e)}
 
-    if filters.search:
-        queryset = queryset.filter(
-            Q(title__icontains=filters.search) |
-            Q(content__icontains=filters.search)
-        )
+        return 200, {
+            "next_cursor": page["next_cursor"],
+            "prev_cursor": page["prev_cursor"],
+            "results": serialize_blogs(page["rows"], fields)
+        }
 
-    paginator = Paginator(queryset, filters.page_size)
-    page_obj = paginator.get_page(filters.page)
+    page = await paginate_by_page(queryset, filters.page, filters.page_size)
 
-    return {
-        "count": paginator.count,
-        "next": page_obj.next_page_number() if page_obj.has_next() else None,
-        "previous": page_obj.previous_page_number() if page_obj.has_previous() else None,
-        "results": [
-            {
-                "id": blog.id,
-                "title": blog.title,
-                "image": blog.image.url if blog.image else None,
-                "author": blog.author.username,
-                "category": blog.category.title if blog.category else None,
-                "tags": [tag.name for tag in blog.tags.all()],
-                "created_at": blog.created_at,
-                "is_active": blog.is_active,
-                "content": blog.content
-            }
-            for blog in page_obj.object_list
-        ]
+    return 200, {
+        "count": page["count"],
+        "next": page["next"],
+        "previous": page["previous"],
+        "results": serialize_blogs(page["rows"], fields)
     }
 
 
-def get_blog(request, blog_id: int):
-    blog = get_object_or_404(Blog, id=blog_id, is_active=True)
-    return {
-        "id": blog.id,
-        "title": blog.title,
-        "content": blog.content,
-        "image": blog.image.url if blog.image else None,
-        "author": blog.author.username,
-        "category": blog.category.title if blog.category else None,
-        "tags": [tag.name for tag in blog.tags.all()],
-        "created_at": blog.created_at,
-        "is_active": blog.is_active
-    }
+@cached_response('blogs')
+async def get_blog(request, blog_id: int):
+    blog = await aget_object_or_404(
+        plan_blogs(Blog.objects.all(), BLOG_DETAIL_FIELDS),
+        id=blog_id,
+        is_active=True
+    )
+    return serialize_blog(blog, BLOG_DETAIL_FIELDS)
 
 
 def create_blog(request, blog: BlogCreateSchema, image: UploadedFile = File(None)):
@@ -108,17 +115,7 @@ def create_blog(request, blog: BlogCreateSchema, image: UploadedFile = File(None
 
         new_blog.tags.add(*blog.tags)
 
-        return 201, {
-            "id": new_blog.id,
-            "title": new_blog.title,
-            "content": new_blog.content,
-            "image": new_blog.image.url if new_blog.image else None,
-            "author": new_blog.author.username,
-            "category": new_blog.category.title if new_blog.category else None,
-            "tags": [tag.name for tag in new_blog.tags.all()],
-            "created_at": new_blog.created_at,
-            "is_active": new_blog.is_active
-        }
+        return 201, get_blog_detail(new_blog.id)
     except Exception as e:
         return 400, {"message": str(e)}
 
@@ -147,7 +144,7 @@ def update_blog(
 
         existing_blog = get_object_or_404(Blog, id=blog_id)
 
-        if existing_blog.author != request.auth:
+        if existing_blog.author_id != request.auth.id:
             return 403, {"message": "You can only edit your own blogs"}
 
         if title is not None:
@@ -190,65 +187,122 @@ def update_blog(
         existing_blog.save()
         print("Blog saved successfully")
 
-        return 200, {
-            "id": existing_blog.id,
-            "title": existing_blog.title,
-            "content": existing_blog.content,
-            "image": existing_blog.image.url if existing_blog.image else None,
-            "author": existing_blog.author.username,
-            "category": existing_blog.category.title if existing_blog.category else None,
-            "tags": [tag.name for tag in existing_blog.tags.all()],
-            "created_at": existing_blog.created_at,
-            "is_active": existing_blog.is_active
-        }
+        return 200, get_blog_detail(existing_blog.id)
     except Exception as e:
         print(f"Error updating blog: {str(e)}")
         return 400, {"message": str(e)}
 
 
+def confirm_blog_image(request, blog_id: int, data: UploadConfirmSchema):
+    blog = get_object_or_404(Blog.objects.only('id', 'author_id', 'image'), id=blog_id)
+
+    if blog.author_id != request.auth.id:
+        return 403, {"message": "You can only edit your own blogs"}
+
+    try:
+        blog.image.name = confirm_upload(request.auth, data.key)
+    except UploadError as e:
+        return 400, {"message": str(e)}
+    blog.save(update_fields=['image'])
+    return 200, get_blog_detail(blog.id)
+
+
 def delete_blog(request, blog_id: int):
     blog = get_object_or_404(Blog, id=blog_id)
 
-    if blog.author != request.auth:
+    if blog.author_id != request.auth.id:
         return 403, {"message": "You can only delete your own blogs"}
 
     blog.delete()
     return 204, None
 
 
-def list_blog_comments(request, blog_id: int):
-    blog = get_object_or_404(Blog, id=blog_id)
-    comments = Comment.objects.filter(blog=blog, parent=None).prefetch_related('children')
+@cached_response(
+    'comments:{blog_id}',
+    validators=('reactions:{blog_id}',),
+    transform=with_pending_reactions
+)
+async def list_blog_comments(request, blog_id: int, filters: CommentFilterSchema = Query(...)):
+    await aget_object_or_404(Blog.objects.only('id'), id=blog_id)
+    threads = Comment.objects.filter(blog_id=blog_id, parent__isnull=True)
+    count = await threads.acount()
 
-    return {
-        "count": comments.count(),
-        "results": [
-            {
-                "id": comment.id,
-                "content": comment.content,
-                "author": comment.author.username,
-                "blog_id": blog_id,
-                "parent_id": comment.parent_id,
-                "created_at": comment.created_at,
-                "likes": comment.likes,
-                "dislikes": comment.dislikes,
-                "children": [
-                    {
-                        "id": child.id,
-                        "content": child.content,
-                        "author": child.author.username,
-                        "blog_id": blog_id,
-                        "parent_id": child.parent_id,
-                        "created_at": child.created_at,
-                        "likes": child.likes,
-                        "dislikes": child.dislikes,
-                        "children": []
-                    }
-                    for child in comment.children.all()
-                ]
-            }
-            for comment in comments
-        ]
+    if filters.cursor:
+        try:
+            threads = threads.filter(tree_id__gt=decode_int_cursor(filters.cursor))
+        except InvalidCursor as e:
+            return 400, {"message": str(e)}
+
+    tree_ids = [
+        tree_id async for tree_id in
+        threads.order_by('tree_id').values_list('tree_id', flat=True)[:filters.page_size + 1]
+    ]
+    has_more = len(tree_ids) > filters.page_size
+    tree_ids = tree_ids[:filters.page_size]
+
+    comments = [
+        comment async for comment in plan_comments(
+            Comment.objects.filter(tree_id__in=tree_ids, level__lte=filters.depth)
+        ).order_by('tree_id', 'lft')
+    ]
+
+    return 200, {
+        "count": count,
+        "next_cursor": encode_key(tree_ids[-1]) if has_more else None,
+        "results": build_comment_threads(comments, filters.depth)
+    }
+
+
+@cached_response(
+    'comments:{blog_id}',
+    validators=('reactions:{blog_id}',),
+    transform=with_pending_reactions
+)
+async def list_comment_replies(
+        request,
+        blog_id: int,
+        comment_id: int,
+        filters: CommentFilterSchema = Query(...)
+):
+    comment = await aget_object_or_404(
+        Comment.objects.only('id', 'tree_id', 'lft', 'rght', 'level'),
+        id=comment_id,
+        blog_id=blog_id
+    )
+    replies = Comment.objects.filter(parent_id=comment.id)
+    count = await replies.acount()
+
+    if filters.cursor:
+        try:
+            replies = replies.filter(lft__gt=decode_int_cursor(filters.cursor))
+        except InvalidCursor as e:
+            return 400, {"message": str(e)}
+
+    bounds = [
+        bound async for bound in
+        replies.order_by('lft').values_list('lft', 'rght')[:filters.page_size + 1]
+    ]
+    has_more = len(bounds) > filters.page_size
+    bounds = bounds[:filters.page_size]
+    if not bounds:
+        return 200, {"count": count, "next_cursor": None, "results": []}
+
+    max_level = comment.level + filters.depth
+    comments = [
+        reply async for reply in plan_comments(
+            Comment.objects.filter(
+                tree_id=comment.tree_id,
+                lft__gte=bounds[0][0],
+                rght__lte=bounds[-1][1],
+                level__lte=max_level
+            )
+        ).order_by('lft')
+    ]
+
+    return 200, {
+        "count": count,
+        "next_cursor": encode_key(bounds[-1][0]) if has_more else None,
+        "results": build_comment_threads(comments, max_level)
     }
 
 
@@ -269,37 +323,20 @@ def create_comment(request, blog_id: int, data: CommentCreateSchema):
         parent=parent
     )
 
-    return 201, {
-        "id": comment.id,
-        "content": comment.content,
-        "author": comment.author.username,
-        "blog_id": blog_id,
-        "parent_id": comment.parent.id if comment.parent else None,
-        "created_at": comment.created_at,
-        "likes": 0,
-        "dislikes": 0,
-        "children": []
-    }
+    return 201, get_comment_detail(comment.id)
 
 
 def update_comment(request, blog_id: int, comment_id: int, data: CommentUpdateSchema):
     try:
         comment = get_object_or_404(Comment, id=comment_id, blog_id=blog_id)
 
-        if comment.author != request.auth:
+        if comment.author_id != request.auth.id:
             return 403, {"message": "Not authorized to update this comment"}
 
         comment.content = data.content
-        comment.save()
+        comment.save(update_fields=['content'])
 
-        return 200, {
-            "id": comment.id,
-            "content": comment.content,
-            "author": comment.author.username,
-            "blog_id": comment.blog_id,
-            "parent_id": comment.parent.id if comment.parent else None,
-            "created_at": comment.created_at
-        }
+        return 200, get_comment_detail(comment.id)
     except Exception as e:
         return 400, {"message": str(e)}
 
@@ -307,148 +344,44 @@ def update_comment(request, blog_id: int, comment_id: int, data: CommentUpdateSc
 def delete_comment(request, blog_id: int, comment_id: int):
     comment = get_object_or_404(Comment, id=comment_id, blog_id=blog_id)
 
-    if comment.author != request.auth:
+    if comment.author_id != request.auth.id:
         return 403, {"message": "Not authorized to delete this comment"}
 
     comment.delete()
     return 204, None
 
 
-def list_categories(request):
-    categories = Category.objects.filter(parent=None).prefetch_related('children')
-
-    def get_category_dict(category):
-        return {
-            "id": category.id,
-            "title": category.title,
-            "parent_id": category.parent_id,
-            "children": [get_category_dict(child) for child in category.children.all()]
-        }
-
-    category_list = [get_category_dict(category) for category in categories]
-
+@conditional_response('categories')
+async def list_categories(request):
+    tree = await sync_to_async(get_category_tree)()
     return {
-        "count": len(category_list),
-        "results": category_list
+        "count": len(tree.roots),
+        "results": tree.roots
     }
 
 
-def get_category(request, category_id: int):
-    category = get_object_or_404(Category, id=category_id)
-
-    def get_category_dict(cat):
-        return {
-            "id": cat.id,
-            "title": cat.title,
-            "parent_id": cat.parent_id,
-            "children": [get_category_dict(child) for child in cat.children.all()]
-        }
-
-    return get_category_dict(category)
+@conditional_response('categories')
+async def get_category(request, category_id: int):
+    tree = await sync_to_async(get_category_tree)()
+    category = tree.get(category_id)
+    if category is None:
+        raise Http404("No Category matches the given query.")
+    return category
 
 
 def like_comment(request, blog_id: int, comment_id: int):
     try:
-        comment = get_object_or_404(Comment, id=comment_id, blog_id=blog_id)
-        comment.likes += 1
-        comment.save()
-
-        children = comment.children.all()
-        children_data = [
-            {
-                "id": child.id,
-                "content": child.content,
-                "author": child.author.username,
-                "blog_id": child.blog_id,
-                "parent_id": child.parent.id if child.parent else None,
-                "created_at": child.created_at,
-                "likes": child.likes,
-                "dislikes": child.dislikes,
-                "children": []
-            }
-            for child in children
-        ]
-
-        return 200, {
-            "id": comment.id,
-            "content": comment.content,
-            "author": comment.author.username,
-            "blog_id": comment.blog_id,
-            "parent_id": comment.parent.id if comment.parent else None,
-            "created_at": comment.created_at,
-            "likes": comment.likes,
-            "dislikes": comment.dislikes,
-            "children": children_data
-        }
+        comment = get_object_or_404(plan_comments(Comment.objects), id=comment_id, blog_id=blog_id)
+        toggle_reaction(request.auth, comment, CommentReaction.LIKE)
+        return 200, merge_pending_reactions([serialize_comment(comment)], request.auth)[0]
     except Exception as e:
         return 400, {"message": str(e)}
 
 
 def dislike_comment(request, blog_id: int, comment_id: int):
     try:
-        comment = get_object_or_404(Comment, id=comment_id, blog_id=blog_id)
-        comment.dislikes += 1
-        comment.save()
-
-        children = comment.children.all()
-        children_data = [
-            {
-                "id": child.id,
-                "content": child.content,
-                "author": child.author.username,
-                "blog_id": child.blog_id,
-                "parent_id": child.parent.id if child.parent else None,
-                "created_at": child.created_at,
-                "likes": child.likes,
-                "dislikes": child.dislikes,
-                "children": []
-            }
-            for child in children
-        ]
-
-        return 200, {
-            "id": comment.id,
-            "content": comment.content,
-            "author": comment.author.username,
-            "blog_id": comment.blog_id,
-            "parent_id": comment.parent.id if comment.parent else None,
-            "created_at": comment.created_at,
-            "likes": comment.likes,
-            "dislikes": comment.dislikes,
-            "children": children_data
-        }
+        comment = get_object_or_404(plan_comments(Comment.objects), id=comment_id, blog_id=blog_id)
+        toggle_reaction(request.auth, comment, CommentReaction.DISLIKE)
+        return 200, merge_pending_reactions([serialize_comment(comment)], request.auth)[0]
     except Exception as e:
         return 400, {"message": str(e)}
-
-
-def list_categories(request):
-    categories = Category.objects.filter(parent=None).prefetch_related('children')
-
-    def get_category_dict(category):
-        return {
-            "id": category.id,
-            "title": category.title,
-            "parent_id": category.parent_id,
-            "children": [get_category_dict(child) for child in category.children.all()]
-        }
-
-    category_list = [get_category_dict(category) for category in categories]
-
-    return {
-        "count": len(category_list),
-        "results": category_list
-    }
-
-
-def get_category(request, category_id: int):
-    category = get_object_or_404(Category, id=category_id)
-
-    def get_category_dict(cat):
-        return {
-            "id": cat.id,
-            "title": cat.title,
-            "parent_id": cat.parent_id,
-            "children": [get_category_dict(child) for child in cat.children.all()]
-        }
-
-    return get_category_dict(category)
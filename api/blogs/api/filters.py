@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from django.utils import timezone
+
+from blogs.categories import get_category_tree
+
+
+def filter_blogs(queryset, filters):
+    if filters.date_from or filters.date_to:
+        try:
+            if filters.date_from:
+                from_date = datetime.strptime(filters.date_from, '%Y-%m-%d')
+                from_date = timezone.make_aware(
+                    datetime.combine(from_date.date(), datetime.min.time())
+                )
+                queryset = queryset.filter(created_at__gte=from_date)
+
+            if filters.date_to:
+                to_date = datetime.strptime(filters.date_to, '%Y-%m-%d')
+                to_date = timezone.make_aware(
+                    datetime.combine(to_date.date(), datetime.max.time())
+                )
+                queryset = queryset.filter(created_at__lte=to_date)
+
+        except ValueError:
+            pass
+
+    if filters.author_id:
+        queryset = queryset.filter(author_id=filters.author_id)
+
+    if filters.category_id:
+        bounds = None
+        if filters.include_descendants:
+            bounds = get_category_tree().get_bounds(filters.category_id)
+        if bounds:
+            tree_id, lft, rght = bounds
+            queryset = queryset.filter(
+                category__tree_id=tree_id,
+                category__lft__gte=lft,
+                category__rght__lte=rght
+            )
+        else:
+            queryset = queryset.filter(category_id=filters.category_id)
+
+    if filters.tags:
+        if filters.match == 'all':
+            queryset = queryset.filter(tag_names__contains=filters.tags)
+        else:
+            queryset = queryset.filter(tag_names__overlap=filters.tags)
+
+    return queryset
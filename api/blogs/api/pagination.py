@@ -0,0 +1,114 @@
+import base64
+import binascii
+import json
+import math
+from datetime import datetime
+
+from django.db.models import Q
+
+
+BLOG_ORDERING = ('-created_at', '-id')
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_key(payload):
+    raw = json.dumps(payload, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_key(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursor("Invalid cursor")
+
+
+def encode_cursor(blog, direction):
+    return encode_key({
+        "c": blog.created_at.isoformat(),
+        "i": blog.id,
+        "d": direction,
+    })
+
+
+def decode_cursor(cursor):
+    payload = decode_key(cursor)
+    try:
+        created_at = datetime.fromisoformat(payload["c"])
+        blog_id = int(payload["i"])
+        direction = payload["d"]
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor("Invalid cursor")
+
+    if direction not in ('next', 'prev') or created_at.tzinfo is None:
+        raise InvalidCursor("Invalid cursor")
+    return direction, created_at, blog_id
+
+
+def decode_int_cursor(cursor):
+    payload = decode_key(cursor)
+    if not isinstance(payload, int):
+        raise InvalidCursor("Invalid cursor")
+    return payload
+
+
+def seek(queryset, direction, position):
+    if direction == 'next':
+        if position:
+            queryset = queryset.filter(
+                Q(created_at__lt=position[0]) |
+                Q(created_at=position[0], id__lt=position[1])
+            )
+        return queryset.order_by(*BLOG_ORDERING)
+
+    return queryset.filter(
+        Q(created_at__gt=position[0]) |
+        Q(created_at=position[0], id__gt=position[1])
+    ).order_by('created_at', 'id')
+
+
+async def paginate_by_cursor(queryset, cursor, page_size):
+    direction, position = 'next', None
+    if cursor:
+        direction, created_at, blog_id = decode_cursor(cursor)
+        position = (created_at, blog_id)
+
+    queryset = seek(queryset, direction, position)
+    rows = [row async for row in queryset[:page_size + 1]]
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    if direction == 'next':
+        has_next, has_prev = has_more, position is not None
+    else:
+        rows.reverse()
+        has_next, has_prev = True, has_more
+
+    return {
+        "rows": rows,
+        "next_cursor": encode_cursor(rows[-1], 'next') if rows and has_next else None,
+        "prev_cursor": encode_cursor(rows[0], 'prev') if rows and has_prev else None,
+    }
+
+
+async def paginate_by_page(queryset, page, page_size):
+    """
+    Same page numbering as ``Paginator.get_page``: pages out of range fall
+    back to the last one.
+    """
+    count = await queryset.acount()
+    num_pages = max(1, math.ceil(count / page_size))
+    if page < 1 or page > num_pages:
+        page = num_pages
+
+    offset = (page - 1) * page_size
+    return {
+        "count": count,
+        "next": page + 1 if page < num_pages else None,
+        "previous": page - 1 if page > 1 else None,
+        "rows": [row async for row in queryset[offset:offset + page_size]],
+    }
@@ -16,7 +16,9 @@ from .endpoints import (
     create_blog,
     update_blog,
     delete_blog,
+    confirm_blog_image,
     list_blog_comments,
+    list_comment_replies,
     create_comment,
     update_comment,
     delete_comment,
@@ -49,7 +51,8 @@ router.add_api_operation(
     "/",
     ["GET"],
     list_blogs,
-    response=PaginatedBlogsSchema,
+    response={200: PaginatedBlogsSchema, 400: ErrorSchema},
+    exclude_unset=True,
     summary="List all blogs"
 )
 
@@ -93,15 +96,32 @@ router.add_api_operation(
     summary="Delete a blog"
 )
 
+router.add_api_operation(
+    "/{blog_id}/image/confirm",
+    ["POST"],
+    confirm_blog_image,
+    response={200: BlogDetailSchema, 400: ErrorSchema, 403: ErrorSchema},
+    auth=AuthBearer(),
+    summary="Use a direct upload as the blog image"
+)
+
 # Comment routes
 router.add_api_operation(
     "/{blog_id}/comments/",
     ["GET"],
     list_blog_comments,
-    response=CommentListSchema,
+    response={200: CommentListSchema, 400: ErrorSchema},
     summary="List blog comments"
 )
 
+router.add_api_operation(
+    "/{blog_id}/comments/{comment_id}/replies/",
+    ["GET"],
+    list_comment_replies,
+    response={200: CommentListSchema, 400: ErrorSchema},
+    summary="List replies to a comment"
+)
+
 router.add_api_operation(
     "/{blog_id}/comments/",
     ["POST"],
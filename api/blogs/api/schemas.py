@@ -1,5 +1,5 @@
-from ninja import Schema
-from typing import List, Optional
+from ninja import Field, Schema
+from typing import Dict, List, Literal, Optional
 from datetime import datetime
 
 
@@ -8,17 +8,40 @@ class ErrorSchema(Schema):
 
 
 class BlogListSchema(Schema):
+    id: Optional[int] = None
+    title: Optional[str] = None
+    excerpt: Optional[str] = None
+    word_count: Optional[int] = None
+    reading_time: Optional[int] = None
+    image: Optional[str] = None
+    image_width: Optional[int] = None
+    image_height: Optional[int] = None
+    image_variants: Optional[Dict[str, str]] = None
+    author: Optional[str] = None
+    category: Optional[str] = None
+    tags: Optional[List[str]] = None
+    created_at: Optional[datetime] = None
+    is_active: Optional[bool] = None
+    content: Optional[str] = None
+    rank: Optional[float] = None
+    headline: Optional[str] = None
+
+
+class BlogDetailSchema(Schema):
     id: int
     title: str
+    excerpt: str
+    word_count: int
+    reading_time: int
     image: Optional[str]
+    image_width: Optional[int]
+    image_height: Optional[int]
+    image_variants: Dict[str, str]
     author: str
     category: Optional[str]
     tags: List[str]
     created_at: datetime
     is_active: bool
-
-
-class BlogDetailSchema(BlogListSchema):
     content: str
 
 
@@ -39,20 +62,27 @@ class BlogUpdateSchema(Schema):
 
 
 class PaginatedBlogsSchema(Schema):
-    count: int
-    next: Optional[int]
-    previous: Optional[int]
+    count: Optional[int] = None
+    next: Optional[int] = None
+    previous: Optional[int] = None
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
     results: List[BlogListSchema]
 
 
 class BlogFilterSchema(Schema):
+    pagination: Literal['page', 'cursor'] = 'page'
     page: int = 1
-    page_size: int = 10
+    page_size: int = Field(10, ge=1, le=100)
+    cursor: Optional[str] = None
+    fields: Optional[str] = None
     date_from: Optional[str] = None
     date_to: Optional[str] = None
     author_id: Optional[int] = None
     category_id: Optional[int] = None
+    include_descendants: bool = False
     tags: Optional[List[str]] = None
+    match: Literal['any', 'all'] = 'any'
     search: Optional[str] = None
 
 
@@ -74,14 +104,24 @@ class CommentSchema(Schema):
     created_at: datetime
     likes: int = 0
     dislikes: int = 0
+    reply_count: int = 0
+    has_more_replies: bool = False
+    my_reaction: Optional[Literal['like', 'dislike']] = None
     children: List['CommentSchema'] = []
 
 
 class CommentListSchema(Schema):
     count: int
+    next_cursor: Optional[str] = None
     results: List[CommentSchema]
 
 
+class CommentFilterSchema(Schema):
+    page_size: int = Field(50, ge=1, le=100)
+    cursor: Optional[str] = None
+    depth: int = Field(5, ge=1, le=10)
+
+
 class TagSchema(Schema):
     id: int
     name: str
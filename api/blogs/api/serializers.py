@@ -0,0 +1,203 @@
+from blogs.models import Blog, Comment
+from images.variants import variant_urls
+
+
+class BlogField:
+    def __init__(self, value, only=(), select_related=(), prefetch_related=()):
+        self.value = value
+        self.only = only
+        self.select_related = select_related
+        self.prefetch_related = prefetch_related
+
+
+BLOG_FIELDS = {
+    "id": BlogField(
+        lambda blog: blog.id,
+        only=("id",)
+    ),
+    "title": BlogField(
+        lambda blog: blog.title,
+        only=("title",)
+    ),
+    "content": BlogField(
+        lambda blog: blog.content,
+        only=("content",)
+    ),
+    "excerpt": BlogField(
+        lambda blog: blog.excerpt,
+        only=("excerpt",)
+    ),
+    "word_count": BlogField(
+        lambda blog: blog.word_count,
+        only=("word_count",)
+    ),
+    "reading_time": BlogField(
+        lambda blog: blog.reading_time,
+        only=("reading_time",)
+    ),
+    "image": BlogField(
+        lambda blog: blog.image.url if blog.image else None,
+        only=("image",)
+    ),
+    "image_width": BlogField(
+        lambda blog: blog.image_width,
+        only=("image_width",)
+    ),
+    "image_height": BlogField(
+        lambda blog: blog.image_height,
+        only=("image_height",)
+    ),
+    "image_variants": BlogField(
+        lambda blog: variant_urls(blog.image, blog.image_variants),
+        only=("image", "image_variants")
+    ),
+    "author": BlogField(
+        lambda blog: blog.author.username,
+        only=("author__username",),
+        select_related=("author",)
+    ),
+    "category": BlogField(
+        lambda blog: blog.category.title if blog.category else None,
+        only=("category__title",),
+        select_related=("category",)
+    ),
+    "tags": BlogField(
+        lambda blog: list(blog.tag_names),
+        only=("tag_names",)
+    ),
+    "created_at": BlogField(
+        lambda blog: blog.created_at,
+        only=("created_at",)
+    ),
+    "is_active": BlogField(
+        lambda blog: blog.is_active,
+        only=("is_active",)
+    ),
+    "rank": BlogField(
+        lambda blog: getattr(blog, 'search_rank', None)
+    ),
+    "headline": BlogField(
+        lambda blog: getattr(blog, 'search_headline', None)
+    ),
+}
+
+BLOG_LIST_FIELDS = (
+    "id",
+    "title",
+    "excerpt",
+    "word_count",
+    "reading_time",
+    "image",
+    "image_width",
+    "image_height",
+    "image_variants",
+    "author",
+    "category",
+    "tags",
+    "created_at",
+    "is_active",
+)
+
+BLOG_DETAIL_FIELDS = BLOG_LIST_FIELDS + ("content",)
+
+BLOG_SELECTABLE_FIELDS = BLOG_DETAIL_FIELDS
+
+BLOG_SEARCH_FIELDS = ("rank", "headline")
+
+
+def plan_blogs(queryset, fields):
+    only, select_related, prefetch_related = [], [], []
+    for name in fields:
+        field = BLOG_FIELDS[name]
+        only.extend(field.only)
+        select_related.extend(field.select_related)
+        prefetch_related.extend(field.prefetch_related)
+
+    queryset = queryset.only(*dict.fromkeys(only))
+    if select_related:
+        queryset = queryset.select_related(*dict.fromkeys(select_related))
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*dict.fromkeys(prefetch_related))
+    return queryset
+
+
+def parse_fields(value):
+    requested = tuple(dict.fromkeys(
+        name.strip() for name in value.split(',') if name.strip()
+    ))
+    unknown = [name for name in requested if name not in BLOG_SELECTABLE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return requested or BLOG_LIST_FIELDS
+
+
+def serialize_blog(blog, fields):
+    return {name: BLOG_FIELDS[name].value(blog) for name in fields}
+
+
+def serialize_blogs(queryset, fields):
+    return [serialize_blog(blog, fields) for blog in queryset]
+
+
+def get_blog_detail(blog_id):
+    blog = plan_blogs(Blog.objects.filter(id=blog_id), BLOG_DETAIL_FIELDS).get()
+    return serialize_blog(blog, BLOG_DETAIL_FIELDS)
+
+
+COMMENT_COLUMNS = (
+    "id",
+    "content",
+    "blog_id",
+    "parent_id",
+    "created_at",
+    "likes",
+    "dislikes",
+    "tree_id",
+    "lft",
+    "rght",
+    "level",
+    "author__username",
+)
+
+
+def plan_comments(queryset):
+    return queryset.select_related('author').only(*COMMENT_COLUMNS)
+
+
+def serialize_comment(comment, max_level=None):
+    return {
+        "id": comment.id,
+        "content": comment.content,
+        "author": comment.author.username,
+        "blog_id": comment.blog_id,
+        "parent_id": comment.parent_id,
+        "created_at": comment.created_at,
+        "likes": comment.likes,
+        "dislikes": comment.dislikes,
+        "reply_count": (comment.rght - comment.lft - 1) // 2,
+        "has_more_replies": (
+            max_level is not None
+            and comment.level >= max_level
+            and not comment.is_leaf_node()
+        ),
+        "children": []
+    }
+
+
+def build_comment_threads(comments, max_level=None):
+    nodes = {}
+    threads = []
+    for comment in comments:
+        node = serialize_comment(comment, max_level)
+        nodes[comment.id] = node
+        parent = nodes.get(comment.parent_id)
+        if parent is None:
+            threads.append(node)
+        else:
+            parent["children"].append(node)
+    return threads
+
+
+def get_comment_detail(comment_id):
+    comment = plan_comments(Comment.objects.filter(id=comment_id)).get()
+    return serialize_comment(comment)
@@ -0,0 +1,66 @@
+from config.cache import LocalSnapshot
+from .models import Category
+
+
+class CategoryTree:
+    """
+    Read-only snapshot of the whole category tree, built from one ordered
+    query. Nodes are pre-serialized dicts shared between requests, so callers
+    must not mutate them.
+    """
+
+    def __init__(self, rows):
+        self.nodes = {}
+        self.bounds = {}
+        roots = []
+
+        for row in rows:
+            node = {
+                "id": row["id"],
+                "title": row["title"],
+                "parent_id": row["parent_id"],
+                "children": []
+            }
+            self.nodes[row["id"]] = node
+            self.bounds[row["id"]] = (row["tree_id"], row["lft"], row["rght"])
+
+            parent = self.nodes.get(row["parent_id"])
+            if parent is None:
+                roots.append(node)
+            else:
+                parent["children"].append(node)
+
+        self.roots = tuple(roots)
+
+    def get(self, category_id):
+        return self.nodes.get(category_id)
+
+    def get_bounds(self, category_id):
+        return self.bounds.get(category_id)
+
+    def descendant_ids(self, category_id):
+        node = self.nodes.get(category_id)
+        if node is None:
+            return []
+
+        ids = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            ids.append(current["id"])
+            stack.extend(current["children"])
+        return ids
+
+
+def _build_category_tree():
+    rows = Category.objects.order_by('tree_id', 'lft').values(
+        'id', 'title', 'parent_id', 'tree_id', 'lft', 'rght'
+    )
+    return CategoryTree(rows)
+
+
+_snapshot = LocalSnapshot('categories', _build_category_tree)
+
+
+def get_category_tree():
+    return _snapshot.get()
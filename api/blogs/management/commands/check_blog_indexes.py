@@ -0,0 +1,195 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blogs.api.filters import filter_blogs
+from blogs.api.pagination import BLOG_ORDERING, seek
+from blogs.api.schemas import BlogFilterSchema
+from blogs.api.serializers import BLOG_LIST_FIELDS, BLOG_SEARCH_FIELDS, plan_blogs
+from blogs.models import Blog, Category
+from blogs.search import search_blogs
+from users.models import User
+
+SEED_PREFIX = 'index-check'
+
+# Zero-based page probed for the OFFSET query of page pagination.
+PROBE_PAGE = 49
+
+# Plans allowed to scan sequentially: counting the unfiltered listing reads
+# every active row, which a seq scan does cheapest.
+EXPECTED_SEQ_SCANS = {'default [page-count]'}
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'EXPLAIN the list_blogs queries for every BlogFilterSchema combination '
+        'and fail if any of them scans the blog table sequentially'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Insert this many synthetic blogs first (rolled back afterwards)'
+        )
+        parser.add_argument('--authors', type=int, default=50)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--tags', type=int, default=200)
+        parser.add_argument('--page-size', type=int, default=10)
+        parser.add_argument('--show-plans', action='store_true')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('This check requires PostgreSQL')
+
+        failures = []
+        try:
+            with transaction.atomic():
+                if options['seed']:
+                    self.seed(
+                        options['seed'],
+                        options['authors'],
+                        options['categories'],
+                        options['tags']
+                    )
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE blogs_blog')
+                failures = self.check_plans(options['page_size'], options['show_plans'])
+                raise Rollback
+        except Rollback:
+            pass
+
+        if failures:
+            raise CommandError(f'Sequential scan on blogs_blog for: {", ".join(failures)}')
+        self.stdout.write(self.style.SUCCESS('All blog listing queries use an index'))
+
+    def seed(self, count, authors, categories, tags):
+        users = User.objects.bulk_create([
+            User(username=f'{SEED_PREFIX}-{i}') for i in range(authors)
+        ])
+        category_ids = [
+            Category.objects.create(title=f'{SEED_PREFIX}-{i}').id
+            for i in range(categories)
+        ]
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                '''
+                INSERT INTO blogs_blog (
+                    title, image, content, author_id, category_id, created_at,
+                    is_active, excerpt, word_count, reading_time, tag_names,
+                    image_variants
+                )
+                SELECT
+                    %s || '-' || n, '', '', (%s::bigint[])[1 + n %% %s],
+                    (%s::bigint[])[1 + n %% %s], now() - n * interval '5 minutes',
+                    n %% 10 <> 0, '', 0, 0,
+                    ARRAY[%s || '-' || n %% %s, %s || '-' || (n / 7) %% %s],
+                    '{}'
+                FROM generate_series(1, %s) AS n
+                ''',
+                [
+                    SEED_PREFIX,
+                    [user.id for user in users], len(users),
+                    category_ids, len(category_ids),
+                    SEED_PREFIX, tags, SEED_PREFIX, tags,
+                    count,
+                ]
+            )
+            # Merge the GIN pending lists so the planner costs the indexes
+            # as it would after autovacuum.
+            for index in ('blog_tag_names_gin', 'blog_search_vector_gin'):
+                cursor.execute('SELECT gin_clean_pending_list(%s::regclass)', [index])
+        self.stdout.write(f'Seeded {count} blogs')
+
+    def combinations(self):
+        active = Blog.objects.filter(is_active=True).order_by('-created_at')
+        blog = active[1000:1001].first() or active.last()
+        if blog is None:
+            raise CommandError('No active blogs to check against; use --seed')
+
+        day = timezone.localtime(blog.created_at).date()
+        date_from = (day - timedelta(days=7)).isoformat()
+        date_to = day.isoformat()
+        author_id = blog.author_id
+        category_id = blog.category_id or Category.objects.values_list('id', flat=True).first()
+        tags = list(blog.tag_names) or list(
+            Blog.objects.exclude(tag_names=[]).values_list('tag_names', flat=True)[:1].first() or []
+        )
+
+        return {
+            'default': {},
+            'date_from': {'date_from': date_from},
+            'date_range': {'date_from': date_from, 'date_to': date_to},
+            'author': {'author_id': author_id},
+            'author+date_range': {'author_id': author_id, 'date_from': date_from, 'date_to': date_to},
+            'category': {'category_id': category_id},
+            'category+date_range': {'category_id': category_id, 'date_from': date_from, 'date_to': date_to},
+            'author+category': {'author_id': author_id, 'category_id': category_id},
+            'category subtree': {'category_id': category_id, 'include_descendants': True},
+            'tags any': {'tags': tags[:1]},
+            'tags all': {'tags': tags, 'match': 'all'},
+            'tags+date_range': {'tags': tags[:1], 'date_from': date_from, 'date_to': date_to},
+        }, (blog.created_at, blog.id), blog.title.split('-')[0] or 'blog'
+
+    def explain_count(self, queryset):
+        """EXPLAIN the COUNT(*) query that page pagination runs."""
+        with CaptureQueriesContext(connection) as queries:
+            queryset.count()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN {queries.captured_queries[-1]['sql']}")
+            return '\n'.join(row[0] for row in cursor.fetchall())
+
+    def plans(self, queryset, page_size, position):
+        offset = PROBE_PAGE * page_size
+        yield 'page', queryset.order_by(*BLOG_ORDERING)[:page_size].explain()
+        yield 'page-count', self.explain_count(queryset)
+        yield f'page-{PROBE_PAGE + 1}', queryset.order_by(*BLOG_ORDERING)[offset:offset + page_size].explain()
+        if position is not None:
+            yield 'cursor-next', seek(queryset, 'next', position)[:page_size + 1].explain()
+            yield 'cursor-prev', seek(queryset, 'prev', position)[:page_size + 1].explain()
+
+    def check_plans(self, page_size, show_plans):
+        combinations, position, search = self.combinations()
+        failures = []
+
+        checks = []
+        for name, params in combinations.items():
+            filters = BlogFilterSchema(page_size=page_size, **params)
+            queryset = plan_blogs(
+                filter_blogs(Blog.objects.filter(is_active=True), filters),
+                BLOG_LIST_FIELDS
+            )
+            checks.append((name, queryset, position))
+
+        # Search only supports page pagination and orders by rank.
+        checks.append((
+            'search',
+            plan_blogs(
+                search_blogs(Blog.objects.filter(is_active=True), search),
+                BLOG_LIST_FIELDS + BLOG_SEARCH_FIELDS
+            ),
+            None
+        ))
+
+        for name, queryset, cursor in checks:
+            for mode, plan in self.plans(queryset, page_size, cursor):
+                label = f'{name} [{mode}]'
+                ok = 'Seq Scan on blogs_blog' not in plan or label in EXPECTED_SEQ_SCANS
+                if not ok:
+                    failures.append(label)
+
+                style = self.style.SUCCESS if ok else self.style.ERROR
+                self.stdout.write(style(f'{"OK  " if ok else "FAIL"} {label}'))
+                if show_plans or not ok:
+                    self.stdout.write(plan)
+
+        return failures
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from blogs.reactions import flush_reactions
+
+
+class Command(BaseCommand):
+    help = 'Apply buffered comment likes/dislikes from Redis to the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Keep running and flush every INTERVAL seconds (default: flush once)'
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+        while True:
+            flushed = flush_reactions()
+            if flushed or not interval:
+                self.stdout.write(f'Flushed reactions for {flushed} comments')
+            if not interval:
+                break
+            close_old_connections()
+            time.sleep(interval)
@@ -0,0 +1,17 @@
+from blogs.models import Blog
+from blogs.text import summarize
+from config.commands import BatchCommand
+
+
+class Command(BatchCommand):
+    help = 'Recompute stored excerpts, word counts and reading times for existing blogs'
+    progress_message = 'Updated {count} blogs'
+    success_message = 'Excerpts rebuilt for {count} blogs'
+
+    def get_queryset(self, options):
+        return Blog.objects.only('id', 'content')
+
+    def process_batch(self, batch):
+        for blog in batch:
+            Blog.objects.filter(pk=blog.pk).update(**summarize(blog.content))
+        return len(batch)
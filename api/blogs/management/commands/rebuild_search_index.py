@@ -0,0 +1,30 @@
+from blogs.models import Blog
+from blogs.search import build_search_vector
+from config.commands import BatchCommand
+
+
+class Command(BatchCommand):
+    help = 'Rebuild the full-text search document for existing blogs'
+    progress_message = 'Indexed {count} blogs'
+    success_message = 'Search index rebuilt for {count} blogs'
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--missing-only',
+            action='store_true',
+            help='Only index blogs that have no search document yet'
+        )
+
+    def get_queryset(self, options):
+        queryset = Blog.objects.only('id', 'title', 'content')
+        if options['missing_only']:
+            queryset = queryset.filter(search_vector__isnull=True)
+        return queryset
+
+    def process_batch(self, batch):
+        for blog in batch:
+            Blog.objects.filter(pk=blog.pk).update(
+                search_vector=build_search_vector(blog.title, blog.content)
+            )
+        return len(batch)
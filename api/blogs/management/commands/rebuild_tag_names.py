@@ -0,0 +1,17 @@
+from blogs.models import Blog
+from blogs.tagging import refresh_tag_names
+from config.commands import BatchCommand
+
+
+class Command(BatchCommand):
+    help = 'Rebuild the denormalized tag_names array for existing blogs'
+    batch_size = 1000
+    progress_message = 'Updated {count} blogs'
+    success_message = 'Tag names rebuilt for {count} blogs'
+
+    def get_queryset(self, options):
+        return Blog.objects.only('id')
+
+    def process_batch(self, batch):
+        refresh_tag_names(Blog, [blog.id for blog in batch])
+        return len(batch)
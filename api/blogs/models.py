@@ -1,9 +1,15 @@
 from django.db import models
 from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from mptt.models import MPTTModel, TreeForeignKey
 from taggit.managers import TaggableManager
 from tinymce.models import HTMLField
 
+from .search import update_search_vector
+from .text import summarize
+
 
 class Category(MPTTModel):
     title = models.CharField(max_length=200)
@@ -28,6 +34,9 @@ class Category(MPTTModel):
 class Blog(models.Model):
     title = models.CharField(max_length=200)
     image = models.ImageField(upload_to='blog_images/')
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     content = HTMLField()
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -40,12 +49,56 @@ class Blog(models.Model):
         blank=True
     )
     tags = TaggableManager()
+    tag_names = ArrayField(
+        models.CharField(max_length=100),
+        default=list,
+        blank=True,
+        editable=False
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True)
+    excerpt = models.CharField(max_length=300, blank=True, default='', editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time = models.PositiveIntegerField(default=0, editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='blog_search_vector_gin'),
+            GinIndex(fields=['tag_names'], name='blog_tag_names_gin'),
+            models.Index(
+                fields=['-created_at', '-id'],
+                name='blog_active_created_idx',
+                condition=models.Q(is_active=True),
+            ),
+            models.Index(
+                fields=['author', '-created_at', '-id'],
+                name='blog_active_author_idx',
+                condition=models.Q(is_active=True),
+            ),
+            models.Index(
+                fields=['category', '-created_at', '-id'],
+                name='blog_active_category_idx',
+                condition=models.Q(is_active=True),
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'content' in update_fields:
+            for field, value in summarize(self.content).items():
+                setattr(self, field, value)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'excerpt', 'word_count', 'reading_time'}
+
+        super().save(*args, **kwargs)
+        if update_fields is None or {'title', 'content'} & set(update_fields):
+            update_search_vector(self)
+
+
 class Comment(MPTTModel):
     content = models.TextField()
     blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name='comments')
@@ -58,5 +111,36 @@ class Comment(MPTTModel):
     class MPTTMeta:
         order_insertion_by = ['created_at']
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['blog', 'tree_id'],
+                name='comment_blog_threads_idx',
+                condition=models.Q(parent__isnull=True),
+            ),
+            models.Index(fields=['parent', 'lft'], name='comment_parent_lft_idx'),
+        ]
+
+    def __str__(self):
+        return f'Comment by {self.author.username} on {self.blog.title}'
+
+
+class CommentReaction(models.Model):
+    LIKE = 1
+    DISLIKE = -1
+    VALUE_CHOICES = (
+        (LIKE, 'Like'),
+        (DISLIKE, 'Dislike'),
+    )
+
+    comment = models.ForeignKey(Comment, on_delete=models.CASCADE, related_name='reactions')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    value = models.SmallIntegerField(choices=VALUE_CHOICES)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'comment'], name='unique_comment_reaction'),
+        ]
+
     def __str__(self):
-        return f'Comment by {self.author.username} on {self.blog.title}'
\ No newline at end of file
+        return f'{self.user} {self.get_value_display().lower()}s comment {self.comment_id}'
@@ -0,0 +1,189 @@
+from collections import defaultdict
+
+from django.db import IntegrityError, connection, transaction
+from django_redis import get_redis_connection
+
+from config.auth import AuthBearer
+from config.cache import bump_generation
+from .models import CommentReaction
+
+PENDING_KEY = 'comment:reactions:pending'
+FLUSHING_KEY = 'comment:reactions:flushing'
+FLUSH_LOCK_KEY = 'comment:reactions:flush-lock'
+REACTION_FIELDS = ('likes', 'dislikes')
+VALUE_FIELDS = {CommentReaction.LIKE: 'likes', CommentReaction.DISLIKE: 'dislikes'}
+VALUE_NAMES = {CommentReaction.LIKE: 'like', CommentReaction.DISLIKE: 'dislike'}
+FLUSH_CHUNK_SIZE = 1000
+
+
+def record_reaction(blog_id, comment_id, deltas):
+    conn = get_redis_connection('default')
+    pipe = conn.pipeline()
+    for field, amount in deltas.items():
+        pipe.hincrby(PENDING_KEY, f'{comment_id}:{field}', amount)
+    pipe.execute()
+    bump_generation(f'reactions:{blog_id}')
+
+
+def toggle_reaction(user, comment, value):
+    """
+    Apply a like/dislike click with toggle semantics and return the user's
+    resulting reaction (or None) plus the counter deltas it caused.
+    """
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                existing = CommentReaction.objects.select_for_update().filter(
+                    user=user,
+                    comment=comment
+                ).first()
+
+                if existing is None:
+                    CommentReaction.objects.create(user=user, comment=comment, value=value)
+                    result, deltas = value, {VALUE_FIELDS[value]: 1}
+                elif existing.value == value:
+                    existing.delete()
+                    result, deltas = None, {VALUE_FIELDS[value]: -1}
+                else:
+                    existing.value = value
+                    existing.save(update_fields=['value'])
+                    result, deltas = value, {VALUE_FIELDS[value]: 1, VALUE_FIELDS[-value]: -1}
+
+                transaction.on_commit(
+                    lambda: record_reaction(comment.blog_id, comment.id, deltas)
+                )
+            return result, deltas
+        except IntegrityError:
+            # Another request from the same user created the row first.
+            if attempt:
+                raise
+
+
+def my_reactions(user, comment_ids):
+    if not user or not comment_ids:
+        return {}
+    return dict(
+        CommentReaction.objects.filter(
+            user=user,
+            comment_id__in=comment_ids
+        ).values_list('comment_id', 'value')
+    )
+
+
+def pending_reactions(comment_ids):
+    """
+    Counter deltas not in the database yet: the pending hash, plus the batch
+    a flush is applying until its transaction commits.
+    """
+    comment_ids = list(comment_ids)
+    if not comment_ids:
+        return {}
+
+    fields = [f'{comment_id}:{field}' for comment_id in comment_ids for field in REACTION_FIELDS]
+    conn = get_redis_connection('default')
+    pipe = conn.pipeline()
+    pipe.hmget(PENDING_KEY, fields)
+    pipe.hmget(FLUSHING_KEY, fields)
+    pending, flushing = pipe.execute()
+
+    deltas = defaultdict(lambda: dict.fromkeys(REACTION_FIELDS, 0))
+    for index, field in enumerate(fields):
+        amount = int(pending[index] or 0) + int(flushing[index] or 0)
+        if amount:
+            comment_id, name = field.split(':')
+            deltas[int(comment_id)][name] += amount
+    return deltas
+
+
+def merge_pending_reactions(comments, user=None):
+    nodes = []
+    stack = list(comments)
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(node.get("children", []))
+
+    comment_ids = [node["id"] for node in nodes]
+    deltas = pending_reactions(comment_ids)
+    reactions = my_reactions(user, comment_ids)
+    for node in nodes:
+        for field, amount in deltas.get(node["id"], {}).items():
+            node[field] += amount
+        node["my_reaction"] = VALUE_NAMES.get(reactions.get(node["id"]))
+    return comments
+
+
+def with_pending_reactions(request, response):
+    status, payload = response if isinstance(response, tuple) else (200, response)
+    if status == 200:
+        merge_pending_reactions(payload["results"], AuthBearer()(request))
+    return response
+
+
+def _parse_deltas(raw):
+    deltas = defaultdict(lambda: dict.fromkeys(REACTION_FIELDS, 0))
+    for field, amount in raw.items():
+        comment_id, name = field.decode().split(':')
+        deltas[int(comment_id)][name] += int(amount)
+    return deltas
+
+
+def _finish_flush(blog_ids):
+    """
+    Drop the applied batch from Redis and expire the cached comment trees
+    together, right after the totals commit, so reads neither count the
+    batch twice nor miss it.
+    """
+    get_redis_connection('default').delete(FLUSHING_KEY)
+    if blog_ids:
+        bump_generation(*(f'comments:{blog_id}' for blog_id in blog_ids))
+
+
+def _apply_deltas(deltas):
+    blog_ids = set()
+    rows = [(comment_id, d['likes'], d['dislikes']) for comment_id, d in deltas.items()]
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(0, len(rows), FLUSH_CHUNK_SIZE):
+            chunk = rows[start:start + FLUSH_CHUNK_SIZE]
+            values = ', '.join(['(%s::bigint, %s::integer, %s::integer)'] * len(chunk))
+            cursor.execute(
+                f'''
+                UPDATE blogs_comment
+                SET likes = blogs_comment.likes + v.likes,
+                    dislikes = blogs_comment.dislikes + v.dislikes
+                FROM (VALUES {values}) AS v(id, likes, dislikes)
+                WHERE blogs_comment.id = v.id
+                RETURNING blogs_comment.blog_id
+                ''',
+                [value for row in chunk for value in row]
+            )
+            blog_ids.update(blog_id for blog_id, in cursor.fetchall())
+        transaction.on_commit(lambda: _finish_flush(blog_ids))
+    return blog_ids
+
+
+def flush_reactions():
+    conn = get_redis_connection('default')
+    lock = conn.lock(FLUSH_LOCK_KEY, timeout=300)
+    if not lock.acquire(blocking=False):
+        return 0
+
+    try:
+        # Take the pending batch atomically, so increments arriving during
+        # the flush land in a fresh pending hash. A leftover flushing hash
+        # means the previous flush died before clearing it; apply it before
+        # taking the next batch.
+        if not conn.exists(FLUSHING_KEY):
+            if not conn.exists(PENDING_KEY):
+                return 0
+            conn.rename(PENDING_KEY, FLUSHING_KEY)
+
+        deltas = _parse_deltas(conn.hgetall(FLUSHING_KEY))
+        if deltas:
+            _apply_deltas(deltas)
+        else:
+            conn.delete(FLUSHING_KEY)
+    finally:
+        lock.release()
+    return len(deltas)
@@ -0,0 +1,47 @@
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+)
+from django.db.models import F, Func, TextField, Value
+
+from .text import plain_text
+
+SEARCH_CONFIG = 'english'
+
+
+def build_search_vector(title, content):
+    return (
+        SearchVector(Value(title or ''), weight='A', config=SEARCH_CONFIG) +
+        SearchVector(Value(plain_text(content)), weight='B', config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vector(blog):
+    type(blog).objects.filter(pk=blog.pk).update(
+        search_vector=build_search_vector(blog.title, blog.content)
+    )
+
+
+def search_blogs(queryset, text):
+    query = SearchQuery(text, search_type='websearch', config=SEARCH_CONFIG)
+    plain_content = Func(
+        F('content'),
+        Value('<[^>]*>'),
+        Value(' '),
+        Value('g'),
+        function='regexp_replace',
+        output_field=TextField()
+    )
+    return queryset.filter(search_vector=query).annotate(
+        search_rank=SearchRank(F('search_vector'), query),
+        search_headline=SearchHeadline(
+            plain_content,
+            query,
+            config=SEARCH_CONFIG,
+            start_sel='<mark>',
+            stop_sel='</mark>',
+            max_fragments=2,
+        ),
+    ).order_by('-search_rank', '-created_at', '-id')
@@ -0,0 +1,54 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from taggit.models import Tag, TaggedItem
+
+from config.cache import invalidate
+from images.queue import enqueue_if_changed
+from .models import Blog, Category, Comment
+from .tagging import refresh_tag_names, sync_tag_names, tagged_blog_ids
+
+
+@receiver([post_save, post_delete], sender=Blog)
+def blog_changed(sender, instance, **kwargs):
+    invalidate('blogs', 'tags')
+
+
+@receiver(post_save, sender=Blog)
+def blog_image_saved(sender, instance, update_fields=None, **kwargs):
+    enqueue_if_changed(instance, 'image', update_fields)
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    invalidate(f'comments:{instance.blog_id}')
+
+
+@receiver([post_save, post_delete], sender=Category)
+def category_changed(sender, instance, **kwargs):
+    invalidate('categories', 'blogs')
+
+
+@receiver(m2m_changed, sender=TaggedItem)
+def blog_tags_changed(sender, instance, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        if isinstance(instance, Blog):
+            sync_tag_names(instance)
+        invalidate('blogs', 'tags')
+
+
+@receiver(post_save, sender=Tag)
+def tag_saved(sender, instance, created, **kwargs):
+    if not created:
+        refresh_tag_names(Blog, tagged_blog_ids(Blog, instance))
+    invalidate('blogs', 'tags')
+
+
+@receiver(pre_delete, sender=Tag)
+def tag_deleting(sender, instance, **kwargs):
+    instance._tagged_blog_ids = tagged_blog_ids(Blog, instance)
+
+
+@receiver(post_delete, sender=Tag)
+def tag_deleted(sender, instance, **kwargs):
+    refresh_tag_names(Blog, getattr(instance, '_tagged_blog_ids', []))
+    invalidate('blogs', 'tags')
@@ -0,0 +1,33 @@
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.contrib.postgres.fields import ArrayField
+from django.db.models import CharField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from taggit.models import TaggedItem
+
+
+def sync_tag_names(blog):
+    names = sorted(blog.tags.names())
+    type(blog).objects.filter(pk=blog.pk).update(tag_names=names)
+    blog.tag_names = names
+
+
+def refresh_tag_names(blog_model, blog_ids):
+    array = ArrayField(CharField(max_length=100))
+    names = TaggedItem.objects.filter(
+        content_type=ContentType.objects.get_for_model(blog_model),
+        object_id=OuterRef('pk')
+    ).values('object_id').annotate(
+        names=ArrayAgg('tag__name', ordering='tag__name')
+    ).values('names')
+
+    return blog_model.objects.filter(pk__in=blog_ids).update(
+        tag_names=Coalesce(Subquery(names, output_field=array), Value([], output_field=array))
+    )
+
+
+def tagged_blog_ids(blog_model, tag):
+    return list(TaggedItem.objects.filter(
+        content_type=ContentType.objects.get_for_model(blog_model),
+        tag=tag
+    ).values_list('object_id', flat=True))
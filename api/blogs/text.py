@@ -0,0 +1,32 @@
+import html
+import math
+import re
+
+from django.utils.html import strip_tags
+
+EXCERPT_LENGTH = 280
+WORDS_PER_MINUTE = 200
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def plain_text(content):
+    text = strip_tags((content or '').replace('<', ' <'))
+    return WHITESPACE_RE.sub(' ', html.unescape(text)).strip()
+
+
+def make_excerpt(text, length=EXCERPT_LENGTH):
+    if len(text) <= length:
+        return text
+    cut = text[:length].rsplit(' ', 1)[0]
+    return f'{cut}…'
+
+
+def summarize(content):
+    text = plain_text(content)
+    word_count = len(text.split())
+    return {
+        "excerpt": make_excerpt(text),
+        "word_count": word_count,
+        "reading_time": math.ceil(word_count / WORDS_PER_MINUTE) if word_count else 0,
+    }
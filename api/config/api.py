@@ -1,10 +1,27 @@
 from ninja import NinjaAPI
+from config.cache import set_validators
 from blogs.api.router import router as blog_router
+from images.api.router import router as uploads_router
 from menu.api.router import router as menu_router
 from tags.api.router import router as tags_router
 from users.api.router import router as users_router
 
-api = NinjaAPI(
+
+class BlogAPI(NinjaAPI):
+    def create_response(self, request, data, *, status=None, temporal_response=None):
+        response = super().create_response(
+            request,
+            data,
+            status=status,
+            temporal_response=temporal_response
+        )
+        validators = getattr(request, 'validators', None)
+        if validators and response.status_code == 200:
+            set_validators(response, *validators)
+        return response
+
+
+api = BlogAPI(
     title='Blog API',
     description='Blog API with JWT authentication',
     version='1.0.0',
@@ -17,3 +34,4 @@ api.add_router("/users/", users_router)
 api.add_router("/blogs/", blog_router)
 api.add_router("/menu/", menu_router)
 api.add_router("/tags/", tags_router)
+api.add_router("/uploads/", uploads_router)
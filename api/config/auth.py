@@ -1,26 +1,130 @@
+import copy
+import time
+
+from asgiref.sync import sync_to_async
 from ninja.security import HttpBearer
 from django.contrib.auth import get_user_model
-from django.shortcuts import get_object_or_404
-from jose import jwt, JWTError
+from jose import JWTError
 from django.conf import settings
 
+from config.cache import LocalTTLCache, get_generations, invalidate
+from config.tokens import decode_token
+
 User = get_user_model()
 
+# Both caches are per worker. Cached users are stamped with the user's
+# generation in Redis and trusted for AUTH_VERSION_CHECK_INTERVAL seconds
+# before it is checked again, so most requests authenticate without a
+# network round trip and a save in another worker (e.g. a password change or
+# deactivation) takes effect everywhere within that interval. Saves in the
+# same worker evict at once; the TTL only bounds memory and token reuse.
+_users = LocalTTLCache(settings.AUTH_USER_CACHE_SIZE, settings.AUTH_CACHE_TIMEOUT)
+_tokens = LocalTTLCache(settings.AUTH_TOKEN_CACHE_SIZE, settings.AUTH_CACHE_TIMEOUT)
+
+
+def _namespace(user_id):
+    return f'user:{user_id}'
+
+
+def _user_version(user_id):
+    (version,), _ = get_generations([_namespace(user_id)])
+    return version
+
+
+def forget_user(user_id):
+    _users.delete(user_id)
+    invalidate(_namespace(user_id))
+
+
+def _cached_entry(token):
+    user_id = _tokens.get(token)
+    entry = _users.get(user_id) if user_id is not None else None
+    return (user_id, entry) if entry is not None else None
+
+
+def _check_due(entry):
+    return time.monotonic() - entry[1] >= settings.AUTH_VERSION_CHECK_INTERVAL
+
+
+def _still_current(user_id, entry):
+    """Compare a cached user's generation with Redis and re-stamp it."""
+    if entry[0] != _user_version(user_id):
+        return False
+    entry[1] = time.monotonic()
+    return True
+
+
+def _user_lookup(token):
+    """
+    Verify the token and return the lookup for its user, or ``None`` when
+    it isn't an access token.
+    """
+    payload = decode_token(token)
+    if payload.get(settings.SIMPLE_JWT['TOKEN_TYPE_CLAIM']) == 'access':
+        lookup = {'id': payload.get(settings.SIMPLE_JWT['USER_ID_CLAIM'])}
+    elif payload.get('username'):
+        # Tokens issued before the user_id claim existed.
+        lookup = {'username': payload['username']}
+    else:
+        return None, payload
+    return lookup, payload
+
+
+def _remember(token, payload, user, version):
+    # [generation, last checked, user]; re-stamped in place on each check.
+    _users.set(user.id, [version, time.monotonic(), user])
+    if 'exp' in payload:
+        _tokens.set(token, user.id, timeout=payload['exp'] - time.time())
+
 
 class AuthBearer(HttpBearer):
     openapi_scheme_name = "Bearer Token"
 
     def authenticate(self, request, token):
-        try:
-            payload = jwt.decode(
-                token,
-                settings.SECRET_KEY,
-                algorithms=['HS256']
-            )
-            username = payload.get('username')
-            if username:
-                user = get_object_or_404(User, username=username)
-                return user
-            return None
-        except JWTError:
-            return None
\ No newline at end of file
+        cached = _cached_entry(token)
+        if cached is not None and (not _check_due(cached[1]) or _still_current(*cached)):
+            user = cached[1][2]
+        else:
+            try:
+                lookup, payload = _user_lookup(token)
+            except JWTError:
+                return None
+            if lookup is None:
+                return None
+
+            # Read the version first: a save racing with the fetch below
+            # then leaves a stale version behind, not a stale user.
+            version = _user_version(lookup['id']) if 'id' in lookup else None
+            user = User.objects.filter(**lookup).first()
+            if user is None:
+                return None
+            _remember(token, payload, user, version or _user_version(user.id))
+
+        # Requests may modify request.auth, so each one gets its own copy.
+        return copy.copy(user)
+
+
+class AsyncAuthBearer(AuthBearer):
+    """AuthBearer for async operations; Redis and database calls run off the event loop."""
+
+    async def authenticate(self, request, token):
+        cached = _cached_entry(token)
+        if cached is not None and (
+            not _check_due(cached[1]) or await sync_to_async(_still_current)(*cached)
+        ):
+            user = cached[1][2]
+        else:
+            try:
+                lookup, payload = _user_lookup(token)
+            except JWTError:
+                return None
+            if lookup is None:
+                return None
+
+            version = await sync_to_async(_user_version)(lookup['id']) if 'id' in lookup else None
+            user = await User.objects.filter(**lookup).afirst()
+            if user is None:
+                return None
+            _remember(token, payload, user, version or await sync_to_async(_user_version)(user.id))
+
+        return copy.copy(user)
@@ -0,0 +1,241 @@
+import asyncio
+import functools
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponseBase
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from pydantic import BaseModel
+
+GENERATION_PREFIX = 'api:gen:'
+MODIFIED_PREFIX = 'api:mod:'
+RESPONSE_PREFIX = 'api:resp:'
+
+
+def _generation_key(namespace):
+    return f'{GENERATION_PREFIX}{namespace}'
+
+
+def _modified_key(namespace):
+    return f'{MODIFIED_PREFIX}{namespace}'
+
+
+def get_generations(namespaces):
+    keys = [_generation_key(namespace) for namespace in namespaces]
+    modified_keys = [_modified_key(namespace) for namespace in namespaces]
+    values = cache.get_many(keys + modified_keys)
+
+    for key, modified_key in zip(keys, modified_keys):
+        if key not in values:
+            cache.add(key, time.time_ns(), timeout=None)
+            values[key] = cache.get(key)
+        if modified_key not in values:
+            cache.add(modified_key, int(time.time()), timeout=None)
+            values[modified_key] = cache.get(modified_key)
+
+    generations = [values[key] for key in keys]
+    last_modified = max(values[key] for key in modified_keys) if modified_keys else None
+    return generations, last_modified
+
+
+def bump_generation(*namespaces):
+    now = int(time.time())
+    for namespace in namespaces:
+        key = _generation_key(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+    cache.set_many({_modified_key(namespace): now for namespace in namespaces}, timeout=None)
+
+
+class LocalSnapshot:
+    """
+    Per-process copy of a value built by ``build``, shared by all requests
+    in the worker and rebuilt only after the namespace's generation changes
+    in Redis, so every worker sees writes without polling the database.
+    """
+
+    def __init__(self, namespace, build):
+        self.namespace = namespace
+        self.build = build
+        self.snapshot = (None, None)
+        self.lock = threading.Lock()
+
+    def get(self):
+        (version,), _ = get_generations([self.namespace])
+        current, value = self.snapshot
+        if current == version:
+            return value
+
+        with self.lock:
+            current, value = self.snapshot
+            if current != version:
+                value = self.build()
+                self.snapshot = (version, value)
+            return value
+
+
+class LocalTTLCache:
+    """
+    Small thread-safe LRU for values that may be served slightly stale from
+    the worker's memory. Entries expire after ``timeout`` seconds and the
+    least recently used ones are dropped once ``maxsize`` is reached.
+    """
+
+    def __init__(self, maxsize, timeout):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires = entry
+            if expires <= time.monotonic():
+                del self.entries[key]
+                return None
+
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        timeout = self.timeout if timeout is None else min(timeout, self.timeout)
+        if timeout <= 0 or self.maxsize <= 0:
+            return
+
+        with self.lock:
+            self.entries[key] = (value, time.monotonic() + timeout)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+
+def invalidate(*namespaces):
+    transaction.on_commit(lambda: bump_generation(*namespaces))
+
+
+def _normalize(value):
+    if isinstance(value, BaseModel):
+        value = value.model_dump()
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in sorted(value.items()) if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def make_response_key(name, generations, params):
+    raw = json.dumps(_normalize(params), sort_keys=True, default=str)
+    digest = hashlib.md5(raw.encode()).hexdigest()
+    versions = '.'.join(str(generation) for generation in generations)
+    return f'{RESPONSE_PREFIX}{name}:{versions}:{digest}'
+
+
+def cached_response(*namespaces, validators=(), transform=None, timeout=None, store=True):
+    """
+    Read-through cache for GET operations. Namespaces may reference the
+    operation's keyword arguments, e.g. ``'comments:{blog_id}'``; bumping a
+    namespace's generation makes every cached response under it unreachable.
+
+    The same generations give each response an ETag and Last-Modified date,
+    so conditional requests are answered with 304 before the view runs.
+    ``validators`` are extra namespaces that only feed the ETag, for data
+    that ``transform`` overlays on the cached payload on every request.
+    With ``store=False`` only the conditional handling is applied.
+
+    Async operations are supported; the Redis round trips of a lookup are
+    then made in one hop off the event loop.
+    """
+    def decorator(func):
+        name = f'{func.__module__}.{func.__name__}'
+
+        def lookup(request, kwargs):
+            resolved = [namespace.format(**kwargs) for namespace in namespaces + validators]
+            generations, last_modified = get_generations(resolved)
+            key = make_response_key(name, generations[:len(namespaces)], kwargs)
+
+            etag = quote_etag(hashlib.md5(f'{key}:{generations}'.encode()).hexdigest())
+            request.validators = (etag, last_modified)
+            not_modified = get_conditional_response(
+                request,
+                etag=etag,
+                last_modified=last_modified
+            )
+            if not_modified is not None:
+                return key, set_validators(not_modified, etag, last_modified)
+            return key, cache.get(key) if store else None
+
+        def save(key, response):
+            if store and (not isinstance(response, tuple) or response[0] == 200):
+                cache.set(
+                    key,
+                    response,
+                    timeout if timeout is not None else settings.API_CACHE_TIMEOUT
+                )
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(request, **kwargs):
+                key, response = await sync_to_async(lookup)(request, kwargs)
+                if isinstance(response, HttpResponseBase):
+                    return response
+
+                if response is None:
+                    response = await func(request, **kwargs)
+                    await sync_to_async(save)(key, response)
+
+                if transform is not None:
+                    response = await sync_to_async(transform)(request, response)
+                return response
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(request, **kwargs):
+            key, response = lookup(request, kwargs)
+            if isinstance(response, HttpResponseBase):
+                return response
+
+            if response is None:
+                response = func(request, **kwargs)
+                save(key, response)
+
+            if transform is not None:
+                response = transform(request, response)
+            return response
+        return wrapper
+    return decorator
+
+
+def conditional_response(*namespaces, validators=(), transform=None):
+    return cached_response(
+        *namespaces,
+        validators=validators,
+        transform=transform,
+        store=False
+    )
+
+
+def set_validators(response, etag, last_modified):
+    response.headers['ETag'] = etag
+    if last_modified is not None:
+        response.headers['Last-Modified'] = http_date(last_modified)
+    response.headers['Cache-Control'] = 'no-cache'
+    patch_vary_headers(response, ('Authorization',))
+    return response
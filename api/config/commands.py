@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+
+class BatchCommand(BaseCommand):
+    """
+    Base for commands that rewrite existing rows. Rows are walked in primary
+    key order, one transaction per batch, so the command can run against a
+    live table. Subclasses provide ``get_queryset`` and ``process_batch``.
+    """
+    batch_size = 500
+    progress_message = 'Updated {count} rows'
+    success_message = 'Updated {count} rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=self.batch_size)
+
+    def get_queryset(self, options):
+        raise NotImplementedError
+
+    def process_batch(self, batch):
+        """Update one batch of rows and return how many were updated."""
+        raise NotImplementedError
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        queryset = self.get_queryset(options).order_by('pk')
+
+        batch = list(queryset[:batch_size])
+        updated = 0
+        while batch:
+            with transaction.atomic():
+                updated += self.process_batch(batch)
+            self.stdout.write(self.progress_message.format(count=updated))
+            batch = list(queryset.filter(pk__gt=batch[-1].pk)[:batch_size])
+
+        self.stdout.write(self.style.SUCCESS(self.success_message.format(count=updated)))
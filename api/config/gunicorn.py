@@ -0,0 +1,43 @@
+"""
+Gunicorn settings for the production run mode
+(``docker-entrypoint.sh web``). Everything can be tuned from the environment.
+"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'uvicorn.workers.UvicornWorker')
+threads = int(os.getenv('GUNICORN_THREADS', 1))
+wsgi_app = 'config.asgi:application' if 'uvicorn' in worker_class else 'config.wsgi:application'
+
+# Load Django once in the master so workers fork with it already imported.
+preload_app = True
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 0))
+
+accesslog = '-'
+errorlog = '-'
+
+
+def on_starting(server):
+    # Runs in the master before any worker is forked, so the snapshots built
+    # here are inherited by every worker. Database sockets and pools must
+    # not be shared across the fork, so they are closed again afterwards and
+    # each worker builds its own pool.
+    from config.warmup import close_connections, warm_up
+
+    warm_up()
+    close_connections()
+
+
+def post_worker_init(worker):
+    # Sync workers serve requests on this thread; other worker classes use
+    # their own threads and open connections on first use.
+    if worker.cfg.worker_class_str == 'sync':
+        from config.warmup import open_connections
+        open_connections()
@@ -0,0 +1,105 @@
+import logging
+import os
+
+from django.conf import settings
+from django.db import connections
+from django.http import Http404, JsonResponse
+from django_redis import get_redis_connection
+
+from outbox.sender import outbox_depth
+
+logger = logging.getLogger(__name__)
+
+HEALTH_PATH = '/health/'
+
+
+def pool_stats(connection):
+    """
+    Counters of this worker's connection pool, or ``None`` without pooling.
+    Wait times are totals since the pool was created.
+    """
+    pool = getattr(connection, 'pool', None)
+    if pool is None:
+        return None
+
+    stats = pool.get_stats()
+    size = stats.get('pool_size', 0)
+    return {
+        'min_size': stats.get('pool_min', 0),
+        'max_size': stats.get('pool_max', 0),
+        'size': size,
+        'in_use': size - stats.get('pool_available', 0),
+        'waiting': stats.get('requests_waiting', 0),
+        'requests': stats.get('requests_num', 0),
+        'requests_queued': stats.get('requests_queued', 0),
+        'wait_ms': stats.get('requests_wait_ms', 0),
+        'timeouts': stats.get('requests_errors', 0),
+        'connections_created': stats.get('connections_num', 0),
+        'connect_ms': stats.get('connections_ms', 0),
+        'connections_lost': stats.get('connections_lost', 0),
+        'returned_bad': stats.get('returns_bad', 0),
+    }
+
+
+def check_database():
+    with connections['default'].cursor() as cursor:
+        cursor.execute('SELECT 1')
+
+
+def check_cache():
+    get_redis_connection('default').ping()
+
+
+CHECKS = {
+    'database': check_database,
+    'cache': check_cache,
+}
+
+
+def health(request):
+    """Readiness probe: 200 when the database and Redis answer, 503 otherwise."""
+    results = {}
+    for name, check in CHECKS.items():
+        try:
+            check()
+            results[name] = 'ok'
+        except Exception:
+            logger.exception('Health check %s failed', name)
+            results[name] = 'error'
+
+    healthy = all(result == 'ok' for result in results.values())
+    return JsonResponse(
+        {'status': 'ok' if healthy else 'unavailable', 'checks': results},
+        status=200 if healthy else 503
+    )
+
+
+def metrics(request):
+    """
+    Connection pool counters of the worker process that served the request.
+    Only answered for clients in METRICS_ALLOWED_IPS.
+    """
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        raise Http404
+    return JsonResponse({
+        'pid': os.getpid(),
+        'database_pools': {
+            connection.alias: pool_stats(connection) for connection in connections.all()
+        },
+        'outbox': outbox_depth(),
+    })
+
+
+class HealthCheckMiddleware:
+    """
+    Answer the health probe before anything validates the Host header, so
+    container probes can use ``localhost`` whatever ALLOWED_HOSTS holds.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.path == HEALTH_PATH:
+            return health(request)
+        return self.get_response(request)
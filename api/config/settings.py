@@ -2,7 +2,7 @@ from pathlib import Path
 import os
 from datetime import timedelta
 
-from django.core.management.utils import get_random_secret_key
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -11,11 +11,16 @@ load_dotenv()
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-# SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = get_random_secret_key()
-
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = os.getenv('DEBUG', 'False') == 'True'
+DEBUG = os.getenv('DEBUG', 'False').lower() in ('true', '1', 'yes')
+
+# SECURITY WARNING: keep the secret key used in production secret!
+# Every worker must share it, so it is never generated at startup.
+SECRET_KEY = os.getenv('SECRET_KEY')
+if not SECRET_KEY:
+    if not DEBUG:
+        raise ImproperlyConfigured('The SECRET_KEY environment variable must be set')
+    SECRET_KEY = 'django-insecure-development-only-key'
 
 ALLOWED_HOSTS = os.getenv('ALLOWED_HOSTS', '').split(',')
 
@@ -26,10 +31,13 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'users',
     'blogs',
     'menu',
     'tags',
+    'images',
+    'outbox',
     'corsheaders',
     'tinymce',
     'mptt',
@@ -39,6 +47,7 @@ INSTALLED_APPS = [
 AUTH_USER_MODEL = 'users.User'
 
 MIDDLEWARE = [
+    'config.health.HealthCheckMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -59,6 +68,13 @@ CACHES = {
     }
 }
 
+API_CACHE_TIMEOUT = int(os.getenv('API_CACHE_TIMEOUT', 300))
+AUTH_CACHE_TIMEOUT = int(os.getenv('AUTH_CACHE_TIMEOUT', 30))
+AUTH_VERSION_CHECK_INTERVAL = float(os.getenv('AUTH_VERSION_CHECK_INTERVAL', 2))
+AUTH_USER_CACHE_SIZE = int(os.getenv('AUTH_USER_CACHE_SIZE', 10000))
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv('AUTH_TOKEN_CACHE_SIZE', 50000))
+BLOCKING_EXECUTOR_WORKERS = int(os.getenv('BLOCKING_EXECUTOR_WORKERS', 4))
+
 SESSION_ENGINE = "django.contrib.sessions.backends.cache"
 SESSION_CACHE_ALIAS = "default"
 SESSION_COOKIE_AGE = 1209600  # 2 weeks in seconds
@@ -96,6 +112,35 @@ DATABASES = {
     }
 }
 
+# Every worker process keeps its own psycopg pool of at most
+# DB_POOL_MAX_SIZE connections, so Postgres sees up to
+# processes * DB_POOL_MAX_SIZE of them; keep that below max_connections.
+# Connections are checked before they are handed out, and requests that
+# find the pool exhausted wait up to DB_POOL_TIMEOUT seconds. With DB_POOL
+# off, connections persist for DB_CONN_MAX_AGE seconds instead, which is
+# only safe under WSGI.
+DB_POOL = os.getenv('DB_POOL', 'true').lower() in ('true', '1', 'yes')
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+if DB_POOL:
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 1)),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 4)),
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+            'max_idle': 5 * 60,
+            'max_lifetime': 30 * 60,
+        },
+    }
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv('DB_CONN_MAX_AGE', 60))
+
+# /health/ is public and served ahead of the ALLOWED_HOSTS check; /metrics/
+# only answers these client addresses (as seen by Django, so list the proxy
+# when the API sits behind one).
+METRICS_ALLOWED_IPS = [
+    ip.strip() for ip in os.getenv('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',') if ip.strip()
+]
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -120,6 +165,19 @@ EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = os.getenv('EMAIL_HOST_USER')
 
+# Emails are queued in the outbox table and delivered by the send_emails
+# worker in batches over one SMTP connection. Failed sends are retried after
+# RETRY_DELAY, doubling up to MAX_RETRY_DELAY, and given up on after
+# MAX_ATTEMPTS. A worker that dies mid-batch releases it after LEASE seconds.
+# Sent and given up emails are deleted RETENTION seconds later, since their
+# bodies can carry password reset links.
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', 50))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', 6))
+EMAIL_OUTBOX_RETRY_DELAY = 30
+EMAIL_OUTBOX_MAX_RETRY_DELAY = 60 * 60
+EMAIL_OUTBOX_LEASE = 5 * 60
+EMAIL_OUTBOX_RETENTION = int(os.getenv('EMAIL_OUTBOX_RETENTION', 24 * 60 * 60))
+
 # JWT Settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=int(os.getenv('JWT_ACCESS_TOKEN_LIFETIME_MINUTES', 15))),
@@ -135,11 +193,79 @@ SIMPLE_JWT = {
     'AUTH_HEADER_NAME': 'HTTP_AUTHORIZATION',
     'USER_ID_FIELD': 'id',
     'USER_ID_CLAIM': 'user_id',
+    'TOKEN_TYPE_CLAIM': 'token_type',
 }
 
+# JWT keyring as comma separated "kid:secret" pairs. All keys verify tokens;
+# new tokens are signed with JWT_ACTIVE_KEY_ID, or the first key. Rotate by
+# adding the new key everywhere first, then making it active, and dropping
+# the old key once the tokens it signed have expired.
+JWT_SIGNING_KEYS = os.getenv('JWT_SIGNING_KEYS', '')
+JWT_ACTIVE_KEY_ID = os.getenv('JWT_ACTIVE_KEY_ID') or None
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# How images.views.serve_media sends files: 'django' streams them itself,
+# 'x-accel' (nginx) and 'x-sendfile' (Apache, lighttpd) only validate the
+# request and let the front proxy send the bytes. For nginx, map
+# MEDIA_ACCEL_PREFIX to MEDIA_ROOT in an ``internal`` location.
+MEDIA_SERVE_MODE = os.getenv('MEDIA_SERVE_MODE', 'django')
+MEDIA_ACCEL_PREFIX = os.getenv('MEDIA_ACCEL_PREFIX', '/protected-media/')
+MEDIA_MAX_AGE = int(os.getenv('MEDIA_MAX_AGE', 3600))
+MEDIA_IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+STORAGES = {
+    'default': {'BACKEND': 'images.storage.HashedFileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+# With MEDIA_STORAGE=s3 media lives in an S3-compatible bucket (AWS, MinIO)
+# and clients upload images straight to it with presigned POSTs. Credentials
+# come from AWS_ACCESS_KEY_ID / AWS_SECRET_ACCESS_KEY. Give the bucket a
+# lifecycle rule expiring IMAGE_UPLOAD_PREFIX, so uploads that were never
+# confirmed don't pile up.
+MEDIA_STORAGE = os.getenv('MEDIA_STORAGE', 'local')
+if MEDIA_STORAGE == 's3':
+    STORAGES['default'] = {
+        'BACKEND': 'images.s3.HashedS3Storage',
+        'OPTIONS': {
+            'bucket_name': os.getenv('AWS_STORAGE_BUCKET_NAME'),
+            'endpoint_url': os.getenv('AWS_S3_ENDPOINT_URL') or None,
+            'region_name': os.getenv('AWS_S3_REGION_NAME') or None,
+            'custom_domain': os.getenv('AWS_S3_CUSTOM_DOMAIN') or None,
+            'querystring_auth': False,
+            'object_parameters': {
+                'CacheControl': f'public, max-age={MEDIA_IMMUTABLE_MAX_AGE}, immutable',
+            },
+        },
+    }
+# Host browsers use for presigned uploads, when it differs from the one the
+# API talks to (e.g. MinIO behind docker-compose networking).
+AWS_S3_UPLOAD_ENDPOINT_URL = os.getenv('AWS_S3_UPLOAD_ENDPOINT_URL') or None
+
+IMAGE_UPLOAD_PREFIX = 'uploads/'
+IMAGE_UPLOAD_MAX_SIZE = int(os.getenv('IMAGE_UPLOAD_MAX_SIZE', 10 * 1024 * 1024))
+IMAGE_UPLOAD_EXPIRES = int(os.getenv('IMAGE_UPLOAD_EXPIRES', 600))
+IMAGE_UPLOAD_CONTENT_TYPES = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/gif': '.gif',
+    'image/webp': '.webp',
+}
+
+# Uploads are always streamed to a temporary file in chunks and hashed on
+# the way; storage then moves them into MEDIA_ROOT instead of copying them
+# through memory.
+FILE_UPLOAD_HANDLERS = ['images.uploadhandler.HashingTemporaryFileUploadHandler']
+
+# Responsive WebP variants built by the process_images worker.
+IMAGE_VARIANT_WIDTHS = (320, 640, 1024, 1600)
+IMAGE_VARIANT_QUALITY = int(os.getenv('IMAGE_VARIANT_QUALITY', 80))
+
+# Stored images nothing has referenced for this long are deleted by gc_images.
+IMAGE_GC_GRACE = int(os.getenv('IMAGE_GC_GRACE', 24 * 60 * 60))
+
 TINYMCE_DEFAULT_CONFIG = {
     'height': 360,
     'width': 800,
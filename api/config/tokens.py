@@ -0,0 +1,67 @@
+import functools
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from jose import jwt, JWTError
+
+DEFAULT_KEY_ID = 'default'
+
+
+class JWTKeyring:
+    """
+    Named HMAC keys shared by every worker. Tokens carry the id of the key
+    that signed them in their ``kid`` header, so several keys can verify at
+    once while only the active one signs.
+    """
+
+    def __init__(self, keys, active_kid=None, algorithm='HS256'):
+        if not keys:
+            raise ImproperlyConfigured('The JWT keyring is empty')
+        self.keys = dict(keys)
+        self.active_kid = active_kid or next(iter(self.keys))
+        if self.active_kid not in self.keys:
+            raise ImproperlyConfigured(f'Unknown active JWT key id: {self.active_kid}')
+        self.algorithm = algorithm
+
+    @classmethod
+    def from_settings(cls):
+        keys = {}
+        for entry in settings.JWT_SIGNING_KEYS.split(','):
+            if not entry.strip():
+                continue
+            kid, sep, secret = entry.strip().partition(':')
+            if not sep or not kid or not secret:
+                raise ImproperlyConfigured('JWT_SIGNING_KEYS entries must look like "kid:secret"')
+            keys[kid] = secret
+
+        if not keys:
+            keys[DEFAULT_KEY_ID] = settings.SECRET_KEY
+        return cls(keys, settings.JWT_ACTIVE_KEY_ID, settings.SIMPLE_JWT['ALGORITHM'])
+
+    def encode(self, claims):
+        return jwt.encode(
+            claims,
+            self.keys[self.active_kid],
+            algorithm=self.algorithm,
+            headers={'kid': self.active_kid}
+        )
+
+    def decode(self, token):
+        kid = jwt.get_unverified_header(token).get('kid')
+        key = self.keys.get(kid)
+        if key is None:
+            raise JWTError('Unknown signing key')
+        return jwt.decode(token, key, algorithms=[self.algorithm])
+
+
+@functools.lru_cache(maxsize=None)
+def get_keyring():
+    return JWTKeyring.from_settings()
+
+
+def encode_token(claims):
+    return get_keyring().encode(claims)
+
+
+def decode_token(token):
+    return get_keyring().decode(token)
@@ -0,0 +1,46 @@
+import logging
+
+from asgiref.sync import async_to_sync
+from django.db import connections
+from django.http import HttpRequest
+
+logger = logging.getLogger(__name__)
+
+
+def open_connections():
+    for connection in connections.all():
+        connection.ensure_connection()
+
+
+def close_connections():
+    """
+    Close every connection and connection pool; neither may be shared with
+    processes forked afterwards.
+    """
+    for connection in connections.all():
+        connection.close()
+        close_pool = getattr(connection, 'close_pool', None)
+        if close_pool is not None:
+            close_pool()
+
+
+def warm_up():
+    """
+    Prime what the first requests would otherwise build: the per-process
+    category and menu snapshots and the shared tag list response.
+    """
+    from blogs.categories import get_category_tree
+    from menu.snapshot import get_menu_snapshot
+    from tags.api.endpoints import list_tags
+    from tags.api.schemas import TagFilterSchema
+
+    try:
+        open_connections()
+        get_category_tree()
+        get_menu_snapshot()
+
+        request = HttpRequest()
+        request.method = 'GET'
+        async_to_sync(list_tags)(request, filters=TagFilterSchema())
+    except Exception:
+        logger.exception('Warm-up failed, continuing with cold caches')
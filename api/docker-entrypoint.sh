@@ -3,16 +3,16 @@
 postgres_ready() {
     python << END
 import sys
-import psycopg2
+import psycopg
 try:
-    psycopg2.connect(
+    psycopg.connect(
         dbname="${POSTGRES_DB}",
         user="${POSTGRES_USER}",
         password="${POSTGRES_PASSWORD}",
         host="${POSTGRES_HOST}",
         port="5432"
     )
-except psycopg2.OperationalError:
+except psycopg.OperationalError:
     sys.exit(-1)
 sys.exit(0)
 END
@@ -25,8 +25,38 @@ done
 
 >&2 echo "Postgres is up - continuing..."
 
-python manage.py makemigrations
-
-python manage.py migrate
+migrate() {
+    python manage.py makemigrations
+    python manage.py migrate
+}
 
-python manage.py runserver 0.0.0.0:8000
\ No newline at end of file
+# dev:       migrate, then the autoreloading development server (default)
+# migrate:   apply migrations and exit; run once per deploy, before web
+# web:       preforked gunicorn workers, no migrations on the boot path
+# reactions: flush buffered comment reactions to the database periodically
+# images:    build resized variants for uploaded images
+# mail:      deliver emails queued in the outbox
+case "${1:-dev}" in
+    dev)
+        migrate
+        exec python manage.py runserver 0.0.0.0:8000
+        ;;
+    migrate)
+        migrate
+        ;;
+    web)
+        exec gunicorn -c config/gunicorn.py
+        ;;
+    reactions)
+        exec python manage.py flush_comment_reactions --interval "${REACTIONS_FLUSH_INTERVAL:-5}"
+        ;;
+    images)
+        exec python manage.py process_images --sweep
+        ;;
+    mail)
+        exec python manage.py send_emails --interval "${EMAIL_OUTBOX_INTERVAL:-30}"
+        ;;
+    *)
+        exec "$@"
+        ;;
+esac
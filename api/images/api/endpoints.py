@@ -0,0 +1,9 @@
+from images.uploads import UploadError, start_upload
+from .schemas import UploadRequestSchema
+
+
+def create_upload(request, data: UploadRequestSchema):
+    try:
+        return 200, start_upload(request.auth, data.filename, data.content_type, data.size)
+    except UploadError as e:
+        return 400, {"message": str(e)}
@@ -0,0 +1,19 @@
+from ninja import Router
+from config.auth import AuthBearer
+from .schemas import ErrorSchema, UploadTicketSchema
+from .endpoints import create_upload
+
+router = Router(tags=["Uploads"])
+
+router.add_api_operation(
+    "/",
+    ["POST"],
+    create_upload,
+    response={200: UploadTicketSchema, 400: ErrorSchema},
+    auth=AuthBearer(),
+    summary="Start a direct image upload",
+    description=(
+        "Get a presigned POST to send an image straight to storage. "
+        "Confirm it afterwards on the blog or profile image endpoint"
+    )
+)
@@ -0,0 +1,23 @@
+from ninja import Schema
+from typing import Dict
+
+
+class ErrorSchema(Schema):
+    message: str
+
+
+class UploadRequestSchema(Schema):
+    filename: str
+    content_type: str
+    size: int
+
+
+class UploadTicketSchema(Schema):
+    key: str
+    url: str
+    fields: Dict[str, str]
+    expires_in: int
+
+
+class UploadConfirmSchema(Schema):
+    key: str
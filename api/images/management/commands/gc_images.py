@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from images.refs import collect_garbage, collect_orphans, rebuild_refs
+
+
+class Command(BaseCommand):
+    help = 'Delete stored images, and their variants, that are no longer referenced'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace',
+            type=int,
+            default=settings.IMAGE_GC_GRACE,
+            help='Seconds a file must have been unreferenced before it is deleted'
+        )
+        parser.add_argument(
+            '--recount',
+            action='store_true',
+            help='Rebuild every reference count from the image fields first'
+        )
+        parser.add_argument(
+            '--orphans',
+            action='store_true',
+            help='Also delete stored files no row has ever referenced'
+        )
+
+    def handle(self, *args, **options):
+        if options['recount']:
+            self.stdout.write(f'Counted references to {rebuild_refs()} files')
+
+        deleted = collect_garbage(options['grace'])
+        if options['orphans']:
+            deleted += collect_orphans(options['grace'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} unreferenced images'))
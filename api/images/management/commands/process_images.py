@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from images.queue import enqueue_missing, pop_image_job, process_image
+
+
+class Command(BaseCommand):
+    help = 'Build resized WebP variants for uploaded images'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sweep',
+            action='store_true',
+            help='Queue every image with missing or stale variants before starting'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once the queue is empty instead of waiting for new uploads'
+        )
+        parser.add_argument('--timeout', type=int, default=5)
+
+    def handle(self, *args, **options):
+        if options['sweep']:
+            self.stdout.write(f'Queued {enqueue_missing()} images')
+
+        while True:
+            job = pop_image_job(options['timeout'])
+            if job is None:
+                if options['once']:
+                    break
+                continue
+
+            try:
+                if process_image(job['model'], job['id'], job['field']):
+                    self.stdout.write(f"Processed {job['model']} {job['id']} {job['field']}")
+            except Exception as e:
+                self.stderr.write(f"Failed {job['model']} {job['id']} {job['field']}: {e}")
+            finally:
+                # Hand the connection back, like the end of a request does.
+                close_old_connections()
@@ -0,0 +1,31 @@
+from django.db import models
+from django.db.models import Q
+
+
+class StoredImage(models.Model):
+    """
+    One stored image file, shared by every row whose image field holds its
+    name, and the variants built from it. ``refcount`` is kept up to date by
+    the signals in ``images.signals``; files nothing references are deleted
+    by the ``gc_images`` command once ``released_at`` is past the grace
+    period.
+    """
+    name = models.CharField(max_length=255, primary_key=True)
+    refcount = models.IntegerField(default=0)
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    variants = models.JSONField(default=dict, blank=True)
+    released_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['released_at'],
+                condition=Q(refcount__lte=0),
+                name='storedimage_unreferenced_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.name} ({self.refcount})'
@@ -0,0 +1,130 @@
+import json
+import logging
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import F
+from django.db.models.fields.json import KT
+from django_redis import get_redis_connection
+from PIL import Image
+
+from config.cache import bump_generation
+from .models import StoredImage
+from .variants import (
+    IMAGE_FIELDS,
+    needs_processing,
+    render_variants,
+    store_variants,
+    variant_fields,
+)
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = 'images:pending'
+
+# Cached API namespaces that embed each model's image variants.
+INVALIDATES = {
+    'blogs.blog': ('blogs',),
+}
+
+
+def _push(jobs):
+    if jobs:
+        get_redis_connection('default').lpush(QUEUE_KEY, *[json.dumps(job) for job in jobs])
+
+
+def enqueue_image(instance, field_name):
+    job = {"model": instance._meta.label_lower, "id": instance.pk, "field": field_name}
+    transaction.on_commit(lambda: _push([job]))
+
+
+def enqueue_if_changed(instance, field_name, update_fields=None):
+    if update_fields is not None and field_name not in update_fields:
+        return
+    if needs_processing(instance, field_name):
+        enqueue_image(instance, field_name)
+
+
+def enqueue_missing(batch_size=1000):
+    """Queue every image whose variants are missing or stale."""
+    queued = 0
+    for label, field_name in IMAGE_FIELDS.items():
+        model = apps.get_model(label)
+        ids = model.objects.exclude(**{field_name: ''}).exclude(
+            **{f'{field_name}__isnull': True}
+        ).alias(
+            processed=KT(f'{field_name}_variants__source')
+        ).exclude(processed=F(field_name)).values_list('pk', flat=True)
+
+        batch = []
+        for pk in ids.iterator(chunk_size=batch_size):
+            batch.append({"model": label, "id": pk, "field": field_name})
+            if len(batch) >= batch_size:
+                _push(batch)
+                queued += len(batch)
+                batch = []
+        _push(batch)
+        queued += len(batch)
+    return queued
+
+
+def pop_image_job(timeout):
+    item = get_redis_connection('default').brpop(QUEUE_KEY, timeout=timeout)
+    return json.loads(item[1]) if item else None
+
+
+def build_variants(file):
+    """
+    Dimensions and variants of a stored file. They are built on first use
+    and kept with the file, so every row sharing it reuses them.
+    """
+    stored, _ = StoredImage.objects.get_or_create(name=file.name)
+    if stored.variants.get('source') == file.name:
+        return stored.width, stored.height, stored.variants
+
+    try:
+        width, height, rendered = render_variants(file)
+    except (OSError, Image.DecompressionBombError) as e:
+        # Not a usable image; record it as processed so it isn't retried.
+        logger.warning('Cannot build variants for %s: %s', file.name, e)
+        width, height, rendered = None, None, {}
+    variants = store_variants(file, rendered)
+
+    StoredImage.objects.filter(name=file.name).update(
+        width=width,
+        height=height,
+        variants=variants
+    )
+    return width, height, variants
+
+
+def process_image(label, pk, field_name):
+    """
+    Copy the variants of one row's file onto the row. The result is only
+    written if the row still points at that file; otherwise the job for the
+    newer upload does the work.
+    """
+    model = apps.get_model(label)
+    width_field, height_field, variants_field = variant_fields(field_name)
+    instance = model.objects.filter(pk=pk).only(field_name, variants_field).first()
+    if instance is None:
+        return False
+
+    file = getattr(instance, field_name)
+    previous = getattr(instance, variants_field) or {}
+    if not file or previous.get('source') == file.name:
+        return False
+
+    width, height, variants = build_variants(file)
+    updated = model.objects.filter(pk=pk, **{field_name: file.name}).update(**{
+        width_field: width,
+        height_field: height,
+        variants_field: variants,
+    })
+    if not updated:
+        return False
+
+    namespaces = INVALIDATES.get(label)
+    if namespaces:
+        bump_generation(*namespaces)
+    return True
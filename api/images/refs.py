@@ -0,0 +1,176 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import StoredImage
+from .storage import CONTENT_DIR
+from .variants import IMAGE_FIELDS, variant_names
+
+
+def adjust_refs(names, delta):
+    """
+    Add ``delta`` to the reference count of each stored file in one
+    statement, creating missing rows for files stored before refcounting.
+    Files whose count drops to zero are stamped with ``released_at``.
+    """
+    names = [name for name in names if name]
+    if not names or not delta:
+        return
+
+    table = StoredImage._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table} (name, refcount, variants, released_at, created_at)
+            SELECT name, GREATEST(%s, 0), '{{}}',
+                   CASE WHEN %s <= 0 THEN NOW() END, NOW()
+            FROM UNNEST(%s::varchar[]) AS name
+            ON CONFLICT (name) DO UPDATE
+            SET refcount = GREATEST({table}.refcount + %s, 0),
+                released_at = CASE
+                    WHEN {table}.refcount + %s > 0 THEN NULL
+                    ELSE COALESCE({table}.released_at, NOW())
+                END
+            """,
+            [delta, delta, names, delta, delta]
+        )
+
+
+def count_refs(names=None):
+    """Number of rows referencing each file, from the image fields themselves."""
+    counts = Counter()
+    for label, field_name in IMAGE_FIELDS.items():
+        rows = apps.get_model(label).objects.exclude(**{field_name: ''}).exclude(
+            **{f'{field_name}__isnull': True}
+        )
+        if names is not None:
+            rows = rows.filter(**{f'{field_name}__in': names})
+        for row in rows.values(field_name).annotate(total=Count('pk')).order_by():
+            counts[row[field_name]] += row['total']
+    return counts
+
+
+def rebuild_refs(names=None):
+    """
+    Recount references from the image fields, for ``names`` or every file.
+    Files no row references any more are released.
+    """
+    counts = count_refs(names)
+    stored = StoredImage.objects.filter(refcount__gt=0)
+    if names is not None:
+        stored = stored.filter(name__in=names)
+
+    with transaction.atomic():
+        stored.update(refcount=0, released_at=timezone.now())
+        StoredImage.objects.bulk_create(
+            [StoredImage(name=name, refcount=total) for name, total in counts.items()],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['name'],
+            update_fields=['refcount', 'released_at']
+        )
+    return len(counts)
+
+
+def names_in_use(names):
+    """
+    Which of ``names`` a stored image still uses, as its own file or as one
+    of its variants. Variants are content-addressed too, so identical
+    renders of different sources share a file, and an upload can match a
+    variant byte for byte.
+    """
+    names = list(names)
+    if not names:
+        return set()
+
+    table = StoredImage._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT name FROM {table} WHERE name = ANY(%s)
+            UNION
+            SELECT variant.value ->> 'name'
+            FROM {table},
+                 jsonb_each(COALESCE({table}.variants -> 'variants', '{{}}')) AS variant
+            WHERE variant.value ->> 'name' = ANY(%s)
+            """,
+            [names, names]
+        )
+        return {name for name, in cursor.fetchall()}
+
+
+def collect_garbage(grace, batch_size=500):
+    """
+    Delete stored files, with their variants, that nothing has referenced
+    for ``grace`` seconds. Files another stored image still uses are kept. Candidates are checked against the image fields
+    first, so counts that drifted (e.g. through queryset updates) are fixed
+    instead of deleting a file in use.
+    """
+    cutoff = timezone.now() - timedelta(seconds=grace)
+    unreferenced = StoredImage.objects.filter(refcount__lte=0, released_at__lt=cutoff)
+
+    deleted = 0
+    last_name = ''
+    while True:
+        names = list(unreferenced.filter(name__gt=last_name).order_by('name').values_list(
+            'name', flat=True
+        )[:batch_size])
+        if not names:
+            break
+        last_name = names[-1]
+
+        in_use = count_refs(names)
+        if in_use:
+            rebuild_refs(list(in_use))
+
+        with transaction.atomic():
+            doomed = list(unreferenced.select_for_update(skip_locked=True).filter(
+                name__in=[name for name in names if name not in in_use]
+            ).values_list('name', 'variants'))
+            StoredImage.objects.filter(name__in=[name for name, _ in doomed]).delete()
+
+        # A row saved meanwhile may have picked the file up again.
+        revived = count_refs([name for name, _ in doomed]) if doomed else {}
+        if revived:
+            rebuild_refs(list(revived))
+
+        files = {
+            name: [name, *variant_names(variants)]
+            for name, variants in doomed if name not in revived
+        }
+        shared = names_in_use(name for names in files.values() for name in names)
+        for names in files.values():
+            for name in names:
+                if name not in shared:
+                    default_storage.delete(name)
+            deleted += 1
+    return deleted
+
+
+def collect_orphans(grace):
+    """
+    Delete files under the content directory that no stored image or
+    variant knows about, e.g. left behind by a request that failed after
+    storing its upload.
+    """
+    known = set()
+    for name, variants in StoredImage.objects.values_list('name', 'variants').iterator():
+        known.add(name)
+        known.update(variant['name'] for variant in (variants or {}).get('variants', {}).values())
+
+    cutoff = timezone.now() - timedelta(seconds=grace)
+    deleted = 0
+    directories, _ = default_storage.listdir(CONTENT_DIR)
+    for directory in directories:
+        _, files = default_storage.listdir(f'{CONTENT_DIR}/{directory}')
+        for filename in files:
+            name = f'{CONTENT_DIR}/{directory}/{filename}'
+            if name not in known and default_storage.get_modified_time(name) < cutoff:
+                default_storage.delete(name)
+                deleted += 1
+    return deleted
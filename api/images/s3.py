@@ -0,0 +1,75 @@
+import mimetypes
+
+from botocore.exceptions import ClientError
+from django.conf import settings
+from storages.backends.s3 import S3Storage
+from storages.utils import clean_name
+
+from .storage import HashedNameMixin
+
+
+class HashedS3Storage(HashedNameMixin, S3Storage):
+    """
+    S3-compatible storage (AWS, MinIO, ...) with content-hashed names and
+    the operations needed for uploads that go straight from the browser to
+    the bucket.
+    """
+
+    def upload_client(self):
+        # Browsers may have to reach the bucket through another host than
+        # the API does, e.g. MinIO inside docker-compose.
+        endpoint_url = getattr(settings, 'AWS_S3_UPLOAD_ENDPOINT_URL', None)
+        if not endpoint_url:
+            return self.connection.meta.client
+        return self._create_session().client(
+            's3',
+            region_name=self.region_name,
+            endpoint_url=endpoint_url,
+            config=self.client_config,
+            verify=self.verify,
+        )
+
+    def presigned_post(self, name, content_type, max_size, expires_in):
+        return self.upload_client().generate_presigned_post(
+            self.bucket_name,
+            self._normalize_name(clean_name(name)),
+            Fields={'Content-Type': content_type},
+            Conditions=[
+                {'Content-Type': content_type},
+                ['content-length-range', 1, max_size],
+            ],
+            ExpiresIn=expires_in,
+        )
+
+    def stat(self, name):
+        try:
+            head = self.connection.meta.client.head_object(
+                Bucket=self.bucket_name,
+                Key=self._normalize_name(clean_name(name))
+            )
+        except ClientError as err:
+            if err.response['ResponseMetadata']['HTTPStatusCode'] == 404:
+                return None
+            raise
+        return {
+            'size': head['ContentLength'],
+            'content_type': head.get('ContentType', ''),
+        }
+
+    def promote(self, name, target):
+        """
+        Move an uploaded object to its content-addressed name with a
+        server-side copy, or drop it if those bytes are already stored.
+        """
+        if not self.exists(target):
+            self.bucket.Object(self._normalize_name(clean_name(target))).copy_from(
+                CopySource={
+                    'Bucket': self.bucket_name,
+                    'Key': self._normalize_name(clean_name(name))
+                },
+                MetadataDirective='REPLACE',
+                ContentType=mimetypes.guess_type(target)[0] or 'application/octet-stream',
+                **self.get_object_parameters(target)
+            )
+        self.delete(name)
+        return target
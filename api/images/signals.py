@@ -0,0 +1,36 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .refs import adjust_refs
+from .variants import IMAGE_FIELDS
+
+
+def image_saving(sender, instance, update_fields=None, **kwargs):
+    field_name = IMAGE_FIELDS[sender._meta.label_lower]
+    instance._stored_image = None
+    if instance.pk is None or (update_fields is not None and field_name not in update_fields):
+        return
+    instance._stored_image = sender.objects.filter(pk=instance.pk).values_list(
+        field_name, flat=True
+    ).first()
+
+
+def image_saved(sender, instance, created, update_fields=None, **kwargs):
+    field_name = IMAGE_FIELDS[sender._meta.label_lower]
+    if not created and update_fields is not None and field_name not in update_fields:
+        return
+
+    previous = getattr(instance, '_stored_image', None)
+    current = getattr(instance, field_name).name
+    if previous != current:
+        adjust_refs([current], 1)
+        adjust_refs([previous], -1)
+
+
+def image_deleted(sender, instance, **kwargs):
+    adjust_refs([getattr(instance, IMAGE_FIELDS[sender._meta.label_lower]).name], -1)
+
+
+for label in IMAGE_FIELDS:
+    pre_save.connect(image_saving, sender=label)
+    post_save.connect(image_saved, sender=label)
+    post_delete.connect(image_deleted, sender=label)
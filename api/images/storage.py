@@ -0,0 +1,48 @@
+import hashlib
+import os
+
+from django.core.files.storage import FileSystemStorage
+
+CONTENT_DIR = 'images'
+
+# Length of the digest in names written before storage was content-addressed.
+HASH_LENGTH = 12
+
+
+def content_hash(content):
+    # Uploads hashed by images.uploadhandler while they were received.
+    digest = getattr(content, 'sha256', None)
+    if digest:
+        return digest
+
+    hasher = hashlib.sha256()
+    for chunk in content.chunks():
+        hasher.update(chunk)
+    content.seek(0)
+    return hasher.hexdigest()
+
+
+def content_name(digest, ext):
+    return f'{CONTENT_DIR}/{digest[:2]}/{digest}{ext.lower()}'
+
+
+class HashedNameMixin:
+    """
+    Store files content-addressed as ``images/<sha[:2]>/<sha256><ext>``,
+    whatever name they were saved under. Identical bytes are stored once and
+    a name always refers to the same bytes, so media can be cached as
+    immutable. Which rows use a file is tracked in ``images.models``.
+    """
+
+    def save(self, name, content, max_length=None):
+        name = content_name(content_hash(content), os.path.splitext(name)[1])
+        if self.exists(name):
+            return name
+        return super().save(name, content, max_length=max_length)
+
+
+class HashedFileSystemStorage(HashedNameMixin, FileSystemStorage):
+    def __init__(self, **kwargs):
+        # Two requests storing the same new file write the same bytes.
+        kwargs.setdefault('allow_overwrite', True)
+        super().__init__(**kwargs)
@@ -0,0 +1,77 @@
+import os
+import uuid
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils.text import get_valid_filename
+
+from .storage import content_hash, content_name
+
+
+class UploadError(ValueError):
+    pass
+
+
+def direct_uploads_enabled(storage=default_storage):
+    return hasattr(storage, 'presigned_post')
+
+
+def _user_prefix(user):
+    return f'{settings.IMAGE_UPLOAD_PREFIX}{user.id}/'
+
+
+def start_upload(user, filename, content_type, size):
+    """
+    Presign a POST that lets the client send one image straight to the
+    bucket. The object lands under the user's staging prefix until the
+    upload is confirmed.
+    """
+    if not direct_uploads_enabled():
+        raise UploadError("Direct uploads are not enabled")
+
+    ext = settings.IMAGE_UPLOAD_CONTENT_TYPES.get(content_type)
+    if ext is None:
+        raise UploadError("Unsupported content type")
+    if not 0 < size <= settings.IMAGE_UPLOAD_MAX_SIZE:
+        raise UploadError(f"Images must be at most {settings.IMAGE_UPLOAD_MAX_SIZE} bytes")
+
+    stem = get_valid_filename(os.path.splitext(os.path.basename(filename))[0])[:64] or 'image'
+    key = f'{_user_prefix(user)}{uuid.uuid4().hex}/{stem}{ext}'
+    post = default_storage.presigned_post(
+        key,
+        content_type,
+        settings.IMAGE_UPLOAD_MAX_SIZE,
+        settings.IMAGE_UPLOAD_EXPIRES
+    )
+    return {
+        "key": key,
+        "url": post['url'],
+        "fields": post['fields'],
+        "expires_in": settings.IMAGE_UPLOAD_EXPIRES,
+    }
+
+
+def confirm_upload(user, key):
+    """
+    Check an uploaded object and move it to its content address, hashing it
+    in one streamed read. Returns the stored name, ready to be assigned to
+    an image field.
+    """
+    if not direct_uploads_enabled():
+        raise UploadError("Direct uploads are not enabled")
+    if not key.startswith(_user_prefix(user)) or '..' in key:
+        raise UploadError("Unknown upload")
+
+    info = default_storage.stat(key)
+    if info is None:
+        raise UploadError("Unknown upload")
+    if (
+        info['size'] > settings.IMAGE_UPLOAD_MAX_SIZE
+        or info['content_type'] not in settings.IMAGE_UPLOAD_CONTENT_TYPES
+    ):
+        default_storage.delete(key)
+        raise UploadError("Invalid upload")
+
+    with default_storage.open(key, 'rb') as file:
+        digest = content_hash(file)
+    return default_storage.promote(key, content_name(digest, os.path.splitext(key)[1]))
@@ -0,0 +1,77 @@
+import io
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+# Image fields that get responsive variants. Each model stores the results
+# next to the field in ``<field>_width``, ``<field>_height`` and
+# ``<field>_variants``.
+IMAGE_FIELDS = {
+    'blogs.blog': 'image',
+    'users.user': 'profile_image',
+}
+
+
+def variant_fields(field_name):
+    return f'{field_name}_width', f'{field_name}_height', f'{field_name}_variants'
+
+
+def needs_processing(instance, field_name):
+    file = getattr(instance, field_name)
+    variants = getattr(instance, f'{field_name}_variants') or {}
+    return bool(file) and variants.get('source') != file.name
+
+
+def target_widths(width):
+    widths = settings.IMAGE_VARIANT_WIDTHS
+    return sorted({w for w in widths if w < width} | {min(width, max(widths))})
+
+
+def render_variants(file):
+    """
+    Decode the original once and re-encode it as WebP at each target width.
+    Returns the original dimensions and ``{"<w>w": (content, width, height)}``.
+    """
+    with file.open('rb'):
+        image = Image.open(file)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+
+    rendered = {}
+    for width in target_widths(image.width):
+        variant = image.copy()
+        variant.thumbnail((width, image.height), Image.LANCZOS)
+        buffer = io.BytesIO()
+        variant.save(buffer, 'WEBP', quality=settings.IMAGE_VARIANT_QUALITY, method=4)
+        rendered[f'{width}w'] = (ContentFile(buffer.getvalue()), variant.width, variant.height)
+    return image.width, image.height, rendered
+
+
+def store_variants(file, rendered):
+    directory, filename = os.path.split(file.name)
+    stem = os.path.splitext(filename)[0]
+
+    variants = {}
+    for key, (content, width, height) in rendered.items():
+        name = file.storage.save(f'{directory}/variants/{stem}-{key}.webp', content)
+        variants[key] = {"name": name, "width": width, "height": height}
+    return {"source": file.name, "variants": variants}
+
+
+def variant_names(variants):
+    return [variant['name'] for variant in (variants or {}).get('variants', {}).values()]
+
+
+def variant_urls(file, variants):
+    """``{"320w": url, ...}`` for the current file, empty until processed."""
+    if not file or not variants or variants.get('source') != file.name:
+        return {}
+    return {
+        key: file.storage.url(variant['name'])
+        for key, variant in variants['variants'].items()
+    }
@@ -0,0 +1,133 @@
+import mimetypes
+import posixpath
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+from .storage import HASH_LENGTH
+
+# Content-addressed names, and ``<stem>.<hash><ext>`` ones stored before.
+HASHED_NAME = re.compile(rf'(/[0-9a-f]{{64}}|\.[0-9a-f]{{{HASH_LENGTH}}})\.[^./]+$')
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+def cache_control(path):
+    if HASHED_NAME.search(path):
+        return f'public, max-age={settings.MEDIA_IMMUTABLE_MAX_AGE}, immutable'
+    return f'public, max-age={settings.MEDIA_MAX_AGE}'
+
+
+def parse_range(header, size):
+    """
+    ``(start, end)`` for a single satisfiable byte range, ``None`` when the
+    whole file should be sent, and ``False`` when the range can't be met.
+    Multi-range requests and invalid ranges (RFC 9110 §14.1.1, e.g. a last
+    byte before the first) get the whole file.
+    """
+    match = RANGE.match(header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if first and last and int(last) < int(first):
+        return None
+    if size == 0:
+        return False
+    if not first:
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start > end or start >= size:
+        return False
+    return start, end
+
+
+def if_range_matches(request, etag, mtime):
+    value = request.headers.get('If-Range')
+    if not value:
+        return True
+    if value.startswith(('"', 'W/')):
+        return value == etag
+    return parse_http_date_safe(value) == int(mtime)
+
+
+def read_range(path, start, length):
+    with open(path, 'rb') as file:
+        file.seek(start)
+        while length > 0:
+            data = file.read(min(CHUNK_SIZE, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+
+
+def serve_media(request, path):
+    """
+    Media files with validators and cache headers. Depending on
+    MEDIA_SERVE_MODE the bytes are sent by Django (with byte-range support)
+    or handed to the front proxy via X-Accel-Redirect / X-Sendfile.
+    """
+    path = posixpath.normpath(path).lstrip('/')
+    try:
+        fullpath = Path(safe_join(settings.MEDIA_ROOT, path))
+    except ValueError:
+        raise Http404('Not found')
+    if not fullpath.is_file():
+        raise Http404('Not found')
+
+    stat = fullpath.stat()
+    etag = quote_etag(f'{int(stat.st_mtime):x}-{stat.st_size:x}')
+    content_type, encoding = mimetypes.guess_type(str(fullpath))
+    content_type = content_type or 'application/octet-stream'
+
+    response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if response is None:
+        mode = settings.MEDIA_SERVE_MODE
+        if mode == 'x-accel':
+            response = HttpResponse(content_type=content_type)
+            response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_PREFIX + path
+        elif mode == 'x-sendfile':
+            response = HttpResponse(content_type=content_type)
+            response['X-Sendfile'] = str(fullpath)
+        else:
+            response = file_response(request, fullpath, stat.st_size, etag, stat.st_mtime, content_type)
+        if encoding:
+            response['Content-Encoding'] = encoding
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Cache-Control'] = cache_control(path)
+    return response
+
+
+def file_response(request, fullpath, size, etag, mtime, content_type):
+    byte_range = None
+    if 'Range' in request.headers and if_range_matches(request, etag, mtime):
+        byte_range = parse_range(request.headers['Range'], size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+    elif byte_range is None:
+        response = FileResponse(fullpath.open('rb'), content_type=content_type)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            read_range(fullpath, start, end - start + 1),
+            status=206,
+            content_type=content_type
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+    response['Accept-Ranges'] = 'bytes'
+    return response
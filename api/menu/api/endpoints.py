@@ -1,16 +1,9 @@
-from menu.models import Menu
+from asgiref.sync import sync_to_async
 
-def get_menu(request):
-    menu_items = Menu.objects.all().order_by('order')
+from config.cache import conditional_response
+from menu.snapshot import get_menu_snapshot
 
-    return {
-        "items": [
-            {
-                "id": item.id,
-                "title": item.title,
-                "url": item.url,
-                "order": item.order
-            }
-            for item in menu_items
-        ]
-    }
+
+@conditional_response('menu')
+async def get_menu(request):
+    return await sync_to_async(get_menu_snapshot)()
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from config.cache import invalidate
+from .models import Menu
+
+
+@receiver([post_save, post_delete], sender=Menu)
+def menu_changed(sender, instance, **kwargs):
+    invalidate('menu')
@@ -0,0 +1,18 @@
+from config.cache import LocalSnapshot
+from .models import Menu
+
+
+def _build_menu():
+    items = Menu.objects.order_by('order', 'id').values('id', 'title', 'url', 'order')
+    return {"items": list(items)}
+
+
+_snapshot = LocalSnapshot('menu', _build_menu)
+
+
+def get_menu_snapshot():
+    """
+    Pre-serialized menu payload held by each worker. It is rebuilt only
+    after a Menu save or delete bumps the ``menu`` generation.
+    """
+    return _snapshot.get()
@@ -0,0 +1,51 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from outbox.sender import outbox_depth, prune_emails, send_batch, wait_for_email
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued outbox emails over SMTP'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help=(
+                'Keep running, waking up for new emails and at least every '
+                'INTERVAL seconds for retries (default: send what is due once)'
+            )
+        )
+        parser.add_argument(
+            '--stats',
+            action='store_true',
+            help='Print the outbox queue depth as JSON and exit'
+        )
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self.stdout.write(json.dumps(outbox_depth()))
+            return
+
+        interval = options['interval']
+        while True:
+            processed = False
+            sent, failed = send_batch()
+            while sent or failed:
+                processed = True
+                self.stdout.write(f'Sent {sent} emails, {failed} failed')
+                sent, failed = send_batch()
+            if processed:
+                self.stdout.write(f'Outbox: {json.dumps(outbox_depth())}')
+
+            pruned = prune_emails()
+            if pruned:
+                self.stdout.write(f'Pruned {pruned} old emails')
+
+            if not interval:
+                break
+            close_old_connections()
+            wait_for_email(interval)
@@ -0,0 +1,147 @@
+import logging
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+WAKEUP_KEY = 'outbox:wakeup'
+
+
+def _wake_sender():
+    conn = get_redis_connection('default')
+    pipe = conn.pipeline()
+    pipe.lpush(WAKEUP_KEY, 1)
+    pipe.ltrim(WAKEUP_KEY, 0, 0)
+    pipe.execute()
+
+
+def queue_email(subject, to, body='', html_body='', from_email=None):
+    """
+    Store an email in the outbox and wake the sender once the surrounding
+    transaction commits. Returns immediately; delivery happens in the
+    ``send_emails`` worker.
+    """
+    email = OutboxEmail.objects.create(
+        subject=subject,
+        body=body,
+        html_body=html_body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL or '',
+        to=list(to),
+    )
+    transaction.on_commit(_wake_sender)
+    return email
+
+
+def wait_for_email(timeout):
+    get_redis_connection('default').brpop(WAKEUP_KEY, timeout=timeout)
+
+
+def pending_emails():
+    return OutboxEmail.objects.filter(sent_at__isnull=True, failed_at__isnull=True)
+
+
+def claim_emails(batch_size):
+    """
+    Lease a batch of due emails to this sender. A sender that dies mid-batch
+    leaves its emails to be picked up again when the lease runs out.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(pending_emails().select_for_update(skip_locked=True).filter(
+            send_after__lte=now
+        ).order_by('send_after').values_list('id', flat=True)[:batch_size])
+        OutboxEmail.objects.filter(id__in=ids).update(
+            send_after=now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE)
+        )
+    return list(OutboxEmail.objects.filter(id__in=ids).order_by('send_after', 'id'))
+
+
+def retry_delay(attempts):
+    """Exponential backoff with jitter: base, 2 * base, 4 * base, ..."""
+    delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    return min(delay, settings.EMAIL_OUTBOX_MAX_RETRY_DELAY) * random.uniform(0.8, 1.2)
+
+
+def build_message(email, connection):
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email or None,
+        to=email.to,
+        connection=connection
+    )
+    if email.html_body:
+        message.attach_alternative(email.html_body, 'text/html')
+    return message
+
+
+def send_batch(batch_size=None):
+    """
+    Send one batch of due emails over a single SMTP connection. Failed
+    emails are rescheduled with backoff, and given up on after
+    EMAIL_OUTBOX_MAX_ATTEMPTS. Returns how many were sent and how many
+    failed.
+    """
+    emails = claim_emails(batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE)
+    if not emails:
+        return 0, 0
+
+    sent = 0
+    connection = get_connection(fail_silently=False)
+    try:
+        for email in emails:
+            email.attempts += 1
+            try:
+                # Opened once and kept open for the rest of the batch.
+                connection.open()
+                connection.send_messages([build_message(email, connection)])
+            except Exception as e:
+                logger.warning('Sending email %s failed (attempt %s): %s', email.id, email.attempts, e)
+                email.last_error = str(e)
+                if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                    email.failed_at = timezone.now()
+                else:
+                    email.send_after = timezone.now() + timedelta(seconds=retry_delay(email.attempts))
+                # The connection may be broken; the next message reopens it.
+                connection.close()
+            else:
+                email.sent_at = timezone.now()
+                sent += 1
+            email.save(update_fields=['attempts', 'last_error', 'send_after', 'sent_at', 'failed_at'])
+    finally:
+        connection.close()
+    return sent, len(emails) - sent
+
+
+def prune_emails():
+    """
+    Delete emails sent or given up on more than EMAIL_OUTBOX_RETENTION
+    seconds ago. Returns how many were deleted.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.EMAIL_OUTBOX_RETENTION)
+    deleted, _ = OutboxEmail.objects.filter(
+        Q(sent_at__lt=cutoff) | Q(failed_at__lt=cutoff)
+    ).delete()
+    return deleted
+
+
+def outbox_depth():
+    """Queue depth for monitoring: due and deferred emails, and given up ones."""
+    now = timezone.now()
+    pending = pending_emails()
+    oldest = pending.order_by('created_at').values_list('created_at', flat=True).first()
+    return {
+        'due': pending.filter(send_after__lte=now).count(),
+        'deferred': pending.filter(send_after__gt=now).count(),
+        'failed': OutboxEmail.objects.filter(failed_at__isnull=False).count(),
+        'oldest_age': (now - oldest).total_seconds() if oldest else 0,
+    }
@@ -1,14 +1,32 @@
-from django.db.models import Count
-from taggit.models import Tag
+from ninja import Query
 
+from config.cache import cached_response
+from tags.models import TagCount
+from .schemas import TagAutocompleteSchema, TagFilterSchema
 
-def list_tags(request):
-    tags = Tag.objects.annotate(count=Count('taggit_taggeditem_items')).order_by('-count', 'name')
+
+def serialize_tags(rows):
     return [
         {
-            "id": tag.id,
-            "name": tag.name,
-            "count": tag.count
+            "id": row["tag_id"],
+            "name": row["name"],
+            "count": row["count"]
         }
-        for tag in tags
-    ]
\ No newline at end of file
+        for row in rows
+    ]
+
+
+@cached_response('tags')
+async def list_tags(request, filters: TagFilterSchema = Query(...)):
+    tags = TagCount.objects.order_by('-count', 'name').values('tag_id', 'name', 'count')
+    if filters.limit is not None:
+        tags = tags[:filters.limit]
+    return serialize_tags([tag async for tag in tags])
+
+
+@cached_response('tags')
+async def autocomplete_tags(request, filters: TagAutocompleteSchema = Query(...)):
+    tags = TagCount.objects.filter(
+        name__istartswith=filters.q.strip()
+    ).order_by('-count', 'name').values('tag_id', 'name', 'count')
+    return serialize_tags([tag async for tag in tags[:filters.limit]])
@@ -1,7 +1,7 @@
 from ninja import Router
 from typing import List
 from .schemas import TagSchema
-from .endpoints import list_tags
+from .endpoints import autocomplete_tags, list_tags
 
 router = Router(tags=["Tags"])
 
@@ -11,5 +11,14 @@ router.add_api_operation(
     list_tags,
     response=List[TagSchema],
     summary="List all tags",
-    description="Get all available tags with their usage count"
-)
\ No newline at end of file
+    description="Get all available tags with their usage count, most used first. Pass limit for the top N"
+)
+
+router.add_api_operation(
+    "/autocomplete/",
+    ["GET"],
+    autocomplete_tags,
+    response=List[TagSchema],
+    summary="Autocomplete tags",
+    description="Get the most used tags whose name starts with the given prefix"
+)
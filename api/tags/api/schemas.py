@@ -1,6 +1,18 @@
-from ninja import Schema
+from typing import Optional
+
+from ninja import Field, Schema
+
 
 class TagSchema(Schema):
     id: int
     name: str
     count: int
+
+
+class TagFilterSchema(Schema):
+    limit: Optional[int] = Field(None, ge=1, le=1000)
+
+
+class TagAutocompleteSchema(Schema):
+    q: str = Field(..., min_length=1, max_length=100)
+    limit: int = Field(10, ge=1, le=50)
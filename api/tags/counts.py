@@ -0,0 +1,66 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from taggit.models import Tag, TaggedItem
+
+from .models import TagCount
+
+
+def adjust_tag_counts(tag_ids, delta):
+    """
+    Add ``delta`` to the usage count of each tag in one statement, creating
+    missing rows so tags that predate the table are picked up lazily.
+    """
+    tag_ids = list(tag_ids)
+    if not tag_ids or not delta:
+        return
+
+    table = TagCount._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table} (tag_id, name, count)
+            SELECT id, name, GREATEST(%s, 0)
+            FROM {Tag._meta.db_table}
+            WHERE id = ANY(%s)
+            ON CONFLICT (tag_id) DO UPDATE
+            SET count = GREATEST({table}.count + %s, 0)
+            """,
+            [delta, tag_ids, delta]
+        )
+
+
+def blog_tag_ids(blog):
+    return list(TaggedItem.objects.filter(
+        content_type=ContentType.objects.get_for_model(blog),
+        object_id=blog.pk
+    ).values_list('tag_id', flat=True))
+
+
+def rebuild_tag_counts(blog_model, tag_ids=None):
+    tags = Tag.objects.all()
+    if tag_ids is not None:
+        tags = tags.filter(id__in=tag_ids)
+
+    active_ids = blog_model.objects.filter(is_active=True).values('id')
+    counts = TaggedItem.objects.filter(
+        tag=OuterRef('pk'),
+        content_type=ContentType.objects.get_for_model(blog_model),
+        object_id__in=active_ids
+    ).values('tag').annotate(total=Count('id')).values('total')
+
+    rows = [
+        TagCount(tag_id=tag['id'], name=tag['name'], count=tag['total'])
+        for tag in tags.values('id', 'name').annotate(
+            total=Coalesce(Subquery(counts), Value(0))
+        )
+    ]
+    TagCount.objects.bulk_create(
+        rows,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['tag'],
+        update_fields=['name', 'count']
+    )
+    return len(rows)
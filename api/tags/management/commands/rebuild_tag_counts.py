@@ -0,0 +1,18 @@
+from taggit.models import Tag
+
+from blogs.models import Blog
+from config.commands import BatchCommand
+from tags.counts import rebuild_tag_counts
+
+
+class Command(BatchCommand):
+    help = 'Recount active blog usage for every tag'
+    batch_size = 1000
+    progress_message = 'Updated {count} tags'
+    success_message = 'Tag counts rebuilt for {count} tags'
+
+    def get_queryset(self, options):
+        return Tag.objects.only('id')
+
+    def process_batch(self, batch):
+        return rebuild_tag_counts(Blog, [tag.id for tag in batch])
@@ -0,0 +1,31 @@
+from django.contrib.postgres.indexes import OpClass
+from django.db import models
+from django.db.models.functions import Upper
+from taggit.models import Tag
+
+
+class TagCount(models.Model):
+    """
+    Number of active blogs using each tag, kept up to date by the signals in
+    ``tags.signals`` instead of being aggregated on every request.
+    """
+    tag = models.OneToOneField(
+        Tag,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='usage'
+    )
+    name = models.CharField(max_length=100)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-count', 'name'], name='tagcount_top_idx'),
+            models.Index(
+                OpClass(Upper('name'), name='text_pattern_ops'),
+                name='tagcount_name_prefix_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.name} ({self.count})'
@@ -0,0 +1,60 @@
+from django.db.models.signals import m2m_changed, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from taggit.models import Tag, TaggedItem
+
+from blogs.models import Blog
+from .counts import adjust_tag_counts, blog_tag_ids
+from .models import TagCount
+
+
+def stored_is_active(blog):
+    return Blog.objects.filter(pk=blog.pk).values_list('is_active', flat=True).first()
+
+
+@receiver(m2m_changed, sender=TaggedItem)
+def blog_tags_changed(sender, instance, action, pk_set, **kwargs):
+    if not isinstance(instance, Blog):
+        return
+
+    # Count against the saved is_active, not the in-memory one: a change
+    # that hasn't been saved yet is applied to all tags by blog_saved.
+    if action == 'post_add' and stored_is_active(instance):
+        adjust_tag_counts(pk_set, 1)
+    elif action == 'post_remove' and stored_is_active(instance):
+        adjust_tag_counts(pk_set, -1)
+    elif action == 'pre_clear':
+        instance._cleared_tag_ids = blog_tag_ids(instance) if stored_is_active(instance) else []
+    elif action == 'post_clear':
+        adjust_tag_counts(instance.__dict__.pop('_cleared_tag_ids', []), -1)
+
+
+@receiver(pre_save, sender=Blog)
+def blog_saving(sender, instance, update_fields=None, **kwargs):
+    instance._was_active = None
+    if instance.pk is None or (update_fields is not None and 'is_active' not in update_fields):
+        return
+    instance._was_active = Blog.objects.filter(pk=instance.pk).values_list(
+        'is_active', flat=True
+    ).first()
+
+
+@receiver(post_save, sender=Blog)
+def blog_saved(sender, instance, created, **kwargs):
+    was_active = getattr(instance, '_was_active', None)
+    if created or was_active is None or was_active == instance.is_active:
+        return
+    adjust_tag_counts(blog_tag_ids(instance), 1 if instance.is_active else -1)
+
+
+@receiver(pre_delete, sender=Blog)
+def blog_deleting(sender, instance, **kwargs):
+    if instance.is_active:
+        adjust_tag_counts(blog_tag_ids(instance), -1)
+
+
+@receiver(post_save, sender=Tag)
+def tag_saved(sender, instance, created, **kwargs):
+    if created:
+        TagCount.objects.get_or_create(tag=instance, defaults={'name': instance.name})
+    else:
+        TagCount.objects.filter(tag=instance).update(name=instance.name)
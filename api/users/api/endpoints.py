@@ -1,12 +1,19 @@
+import logging
+
 from ninja import File
 from ninja.files import UploadedFile
 from django.contrib.auth import get_user_model
-from django.shortcuts import get_object_or_404
-from django.core.mail import send_mail
+from django.contrib.auth.hashers import make_password, verify_password
+from django.shortcuts import aget_object_or_404
 from datetime import datetime, timedelta
 from jose import jwt
 import secrets
 from django.conf import settings
+from config.executor import run_blocking
+from config.tokens import decode_token, encode_token
+from images.api.schemas import UploadConfirmSchema
+from images.uploads import UploadError, confirm_upload
+from outbox.sender import queue_email
 from django.template.loader import render_to_string
 import string
 from .schemas import (
@@ -20,34 +27,47 @@ from .schemas import (
 
 User = get_user_model()
 
+logger = logging.getLogger(__name__)
+
+
+async def check_password(user, raw_password):
+    """
+    Async ``User.check_password`` that hashes on the blocking executor and
+    still upgrades hashes made with outdated parameters.
+    """
+    is_correct, must_update = await run_blocking(verify_password, raw_password, user.password)
+    if is_correct and must_update:
+        user.password = await run_blocking(make_password, raw_password)
+        await user.asave(update_fields=['password'])
+    return is_correct
 
-def register(request, data: RegisterSchema):
-    if User.objects.filter(username=data.username).exists():
+
+async def register(request, data: RegisterSchema):
+    if await User.objects.filter(username=data.username).aexists():
         return 400, {"message": "Username already exists"}
-    if User.objects.filter(email=data.email).exists():
+    if await User.objects.filter(email=data.email).aexists():
         return 400, {"message": "Email already registered"}
 
-    user = User.objects.create_user(
-        username=data.username,
-        email=data.email,
-        password=data.password,
+    user = User(
+        username=User.normalize_username(data.username),
+        email=User.objects.normalize_email(data.email),
+        password=await run_blocking(make_password, data.password),
         first_name=data.first_name or "",
         last_name=data.last_name or ""
     )
+    await user.asave()
     return 201, user
 
 
-def login(request, data: AuthSchema):
-    user = get_object_or_404(User, username=data.username)
-    if user.check_password(data.password):
-        token = jwt.encode(
-            {
-                'username': user.username,
-                'exp': datetime.utcnow() + settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME']
-            },
-            settings.SECRET_KEY,
-            algorithm='HS256'
-        )
+async def login(request, data: AuthSchema):
+    user = await aget_object_or_404(User, username=data.username)
+    if await check_password(user, data.password):
+        token = encode_token({
+            settings.SIMPLE_JWT['USER_ID_CLAIM']: user.id,
+            settings.SIMPLE_JWT['TOKEN_TYPE_CLAIM']: 'access',
+            'username': user.username,
+            'exp': datetime.utcnow() + settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME']
+        })
         return 200, {'access_token': token, 'token_type': 'bearer'}
     return 401, {'message': 'Invalid credentials'}
 
@@ -57,24 +77,41 @@ def update_profile(request, data: UserUpdateSchema):
     if data.email and User.objects.exclude(id=user.id).filter(email=data.email).exists():
         return 400, {"message": "Email already registered"}
 
+    changed = []
     if data.email:
         user.email = data.email
+        changed.append('email')
     if data.first_name:
         user.first_name = data.first_name
+        changed.append('first_name')
     if data.last_name:
         user.last_name = data.last_name
-    user.save()
+        changed.append('last_name')
+    # request.auth may be a slightly stale cached copy; only write what the
+    # request changed.
+    if changed:
+        user.save(update_fields=changed)
     return 200, user
 
 
-def upload_profile_image(request, file: UploadedFile = File(...)):
+async def upload_profile_image(request, file: UploadedFile = File(...)):
     user = request.auth
-    user.profile_image.save(file.name, file)
-    user.save()
+    await run_blocking(user.profile_image.save, file.name, file, save=False)
+    await user.asave(update_fields=['profile_image'])
     return 200, {"message": "Profile image updated"}
 
 
-def get_profile(request):
+def confirm_profile_image(request, data: UploadConfirmSchema):
+    user = request.auth
+    try:
+        user.profile_image.name = confirm_upload(user, data.key)
+    except UploadError as e:
+        return 400, {"message": str(e)}
+    user.save(update_fields=['profile_image'])
+    return 200, user
+
+
+async def get_profile(request):
     return request.auth
 
 
@@ -88,7 +125,7 @@ def change_password(request, data: PasswordChangeSchema):
         return 400, {"message": "New passwords do not match"}
 
     user.set_password(data.new_password)
-    user.save()
+    user.save(update_fields=['password'])
 
     return 200, {"message": "Password changed successfully"}
 
@@ -110,11 +147,12 @@ def request_password_reset(request, data: PasswordResetRequestSchema):
     except User.DoesNotExist:
         return 404, {"message": "User with this email does not exist"}
 
-    reset_token = jwt.encode({
+    reset_token = encode_token({
         'user_id': user.id,
         'email': user.email,
+        settings.SIMPLE_JWT['TOKEN_TYPE_CLAIM']: 'password_reset',
         'exp': datetime.utcnow() + timedelta(minutes=30)
-    }, settings.SECRET_KEY, algorithm='HS256')
+    })
 
     reset_url = f"{settings.FRONTEND_URL}/reset-password?token={reset_token}"
 
@@ -125,25 +163,24 @@ def request_password_reset(request, data: PasswordResetRequestSchema):
             'site_name': settings.SITE_NAME
         })
 
-        send_mail(
+        queue_email(
             subject="Password Reset Request",
-            message="",
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-            fail_silently=False,
-            html_message=html_message  # HTML version
+            to=[user.email],
+            html_body=html_message
         )
 
         return 200, {"message": "Password reset instructions have been sent to your email"}
 
-    except Exception as e:
-        print(f"Error sending email: {str(e)}")  # For debugging
+    except Exception:
+        logger.exception('Queueing password reset email for user %s failed', user.id)
         return 500, {"message": "Failed to send password reset email. Please try again later"}
 
 
 def confirm_password_reset(request, data: PasswordResetConfirmSchema):
     try:
-        payload = jwt.decode(data.token, settings.SECRET_KEY, algorithms=['HS256'])
+        payload = decode_token(data.token)
+        if payload.get(settings.SIMPLE_JWT['TOKEN_TYPE_CLAIM']) != 'password_reset':
+            raise jwt.JWTError('Not a password reset token')
         user = User.objects.get(id=payload['user_id'], email=payload['email'])
 
         if data.new_password != data.confirm_password:
@@ -1,5 +1,5 @@
 from ninja import Router
-from config.auth import AuthBearer
+from config.auth import AsyncAuthBearer, AuthBearer
 from .schemas import (
     TokenSchema,
     UserProfileSchema,
@@ -11,6 +11,7 @@ from .endpoints import (
     login,
     update_profile,
     upload_profile_image,
+    confirm_profile_image,
     get_profile,
     change_password,
     request_password_reset,
@@ -42,7 +43,7 @@ router.add_api_operation(
     ["GET"],
     get_profile,
     response=UserProfileSchema,
-    auth=AuthBearer(),
+    auth=AsyncAuthBearer(),
     summary="Get user profile"
 )
 
@@ -60,10 +61,19 @@ router.add_api_operation(
     ["POST"],
     upload_profile_image,
     response={200: SuccessSchema, 400: ErrorSchema},
-    auth=AuthBearer(),
+    auth=AsyncAuthBearer(),
     summary="Upload profile image"
 )
 
+router.add_api_operation(
+    "/profile/image/confirm",
+    ["POST"],
+    confirm_profile_image,
+    response={200: UserProfileSchema, 400: ErrorSchema},
+    auth=AuthBearer(),
+    summary="Use a direct upload as the profile image"
+)
+
 router.add_api_operation(
     "/change-password",
     ["POST"],
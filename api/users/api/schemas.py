@@ -1,5 +1,7 @@
 from ninja import Schema
-from typing import Optional
+from typing import Dict, Optional
+
+from images.variants import variant_urls
 
 class TokenSchema(Schema):
     access_token: str
@@ -41,6 +43,13 @@ class UserProfileSchema(Schema):
     first_name: Optional[str]
     last_name: Optional[str]
     profile_image: Optional[str]
+    profile_image_width: Optional[int]
+    profile_image_height: Optional[int]
+    profile_image_variants: Dict[str, str]
+
+    @staticmethod
+    def resolve_profile_image_variants(obj):
+        return variant_urls(obj.profile_image, obj.profile_image_variants)
 
 class ErrorSchema(Schema):
     message: str
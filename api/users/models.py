@@ -7,6 +7,9 @@ class User(AbstractUser):
         null=True,
         blank=True
     )
+    profile_image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    profile_image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    profile_image_variants = models.JSONField(default=dict, blank=True, editable=False)
     password_reset_token = models.CharField(
         max_length=100,
         null=True,
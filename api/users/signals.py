@@ -0,0 +1,18 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from config.auth import forget_user
+from images.queue import enqueue_if_changed
+
+User = get_user_model()
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance, **kwargs):
+    forget_user(instance.id)
+
+
+@receiver(post_save, sender=User)
+def user_image_saved(sender, instance, update_fields=None, **kwargs):
+    enqueue_if_changed(instance, 'profile_image', update_fields)